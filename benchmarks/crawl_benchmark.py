@@ -0,0 +1,323 @@
+"""Run crawl() end to end against the local stub servers and report throughput and per-stage latency.
+
+Usage: python benchmarks/crawl_benchmark.py [--jobs 100] [--passes 2] [--linkedin-latency 50] [--async] [--json results.json] [--compare baseline.json]
+
+The stubs run in a child process (benchmarks/stub_server.py) so CPU time and RSS belong to the
+fetcher alone. Each pass reports jobs/sec, latency percentiles for the main stages and for each
+kind of HTTP request, request counts per stub server and route, CPU seconds and peak RSS. Later
+passes reuse the state database, so they measure the warm path of a repeated run.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+# fetcher.py functions timed as pipeline stages
+STAGE_FUNCTIONS = [
+    "fetch_job_record",
+    "resolve_application",
+    "enrich_company",
+    "scrape_job_details",
+    "scrape_company_profile",
+    "extract_job_page",
+    "extract_company_page",
+    "build_company_payload",
+    "build_job_payload",
+    "save_company_to_wordpress",
+    "save_article_to_wordpress",
+]
+
+class Recorder:
+    """Collects durations per stage from every worker thread."""
+
+    def __init__(self):
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.samples.setdefault(name, []).append(seconds * 1000)
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+
+    def summary(self):
+        with self.lock:
+            return {name: percentiles(values) for name, values in sorted(self.samples.items())}
+
+def percentiles(values):
+    ordered = sorted(values)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1], 3),
+        "total_ms": round(sum(ordered), 3),
+    }
+
+def timed(recorder, name, func):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            recorder.add(name, time.perf_counter() - started)
+    return wrapper
+
+def instrument(fetcher, recorder, bases):
+    """Wrap the stage functions, parse_html, batch flushes and HTTP requests with timers."""
+    for name in STAGE_FUNCTIONS:
+        if hasattr(fetcher, name):
+            setattr(fetcher, name, timed(recorder, name, getattr(fetcher, name)))
+
+    parse_html = fetcher.parse_html
+
+    def timed_parse_html(markup, page=None, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return parse_html(markup, page, *args, **kwargs)
+        finally:
+            recorder.add(f"parse_html:{page or 'full'}", time.perf_counter() - started)
+    fetcher.parse_html = timed_parse_html
+
+    if hasattr(fetcher, "BatchWriter"):
+        fetcher.BatchWriter.flush = timed(recorder, "batch_flush", fetcher.BatchWriter.flush)
+
+    servers = {urlparse(base).netloc: name for name, base in bases.items()}
+    request = fetcher.HttpClient.request
+
+    def timed_request(self, method, url, *args, **kwargs):
+        parsed = urlparse(url)
+        server = servers.get(parsed.netloc, parsed.netloc)
+        parts = [part for part in parsed.path.split("/") if part]
+        depth = {"wp-json": 4, "jobs": 2}.get(parts[0] if parts else "", 1)
+        route = "/".join(parts[:depth]) or "/"
+        started = time.perf_counter()
+        try:
+            return request(self, method, url, *args, **kwargs)
+        finally:
+            recorder.add(f"http:{server}:{method.upper()} {route}", time.perf_counter() - started)
+    fetcher.HttpClient.request = timed_request
+
+def start_stubs(args):
+    command = [
+        sys.executable, os.path.join(BENCH_DIR, "stub_server.py"),
+        "--jobs", str(args.jobs),
+        "--linkedin-latency", str(args.linkedin_latency),
+        "--wp-latency", str(args.wp_latency),
+        "--external-latency", str(args.external_latency),
+    ]
+    if args.no_batch_route:
+        command.append("--no-batch-route")
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line:
+        process.kill()
+        raise RuntimeError("stub server did not start")
+    return process, json.loads(line)
+
+def stub_stats(session, bases):
+    return session.get(f"{bases['wordpress']}/__stats", timeout=10).json()
+
+def diff_counts(after, before):
+    result = {}
+    for server, routes in after.items():
+        for route, count in routes.items():
+            delta = count - before.get(server, {}).get(route, 0)
+            if delta:
+                result.setdefault(server, {})[route] = delta
+    return result
+
+def rss_kib():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss_kib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+def run_pass(fetcher, recorder, auth_headers, counts_before, session, bases):
+    stats_holder = []
+
+    class RecordedStats(fetcher.CrawlStats):
+        def __init__(self):
+            super().__init__()
+            stats_holder.append(self)
+
+    crawl_stats = fetcher.CrawlStats
+    fetcher.CrawlStats = RecordedStats
+    recorder.reset()
+    if hasattr(fetcher, "metrics"):
+        fetcher.metrics.reset()
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    try:
+        if fetcher.FETCHER_MODE == "async":
+            asyncio.run(fetcher.crawl_async(auth_headers, fetcher.load_processed_ids()))
+        else:
+            fetcher.crawl(auth_headers, fetcher.load_processed_ids())
+    finally:
+        fetcher.CrawlStats = crawl_stats
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    stats = stats_holder[-1]
+    counts_after = stub_stats(session, bases)
+    return {
+        "wall_s": round(wall, 3),
+        "cpu_s": round(cpu, 3),
+        "jobs_total": stats.total,
+        "jobs_posted": stats.success,
+        "jobs_failed": stats.failure,
+        "jobs_per_sec": round(stats.total / wall, 3) if wall else None,
+        "rss_kib": rss_kib(),
+        "peak_rss_kib": peak_rss_kib(),
+        "stages": recorder.summary(),
+        "requests": diff_counts(counts_after, counts_before),
+        "metrics": fetcher.metrics.summary() if hasattr(fetcher, "metrics") else None,
+    }, counts_after
+
+def print_pass(number, result):
+    print(f"\n--- Pass {number} ---")
+    print(f"{result['jobs_total']} jobs ({result['jobs_posted']} posted, {result['jobs_failed']} failed) in {result['wall_s']:.2f}s: {result['jobs_per_sec']} jobs/sec")
+    print(f"CPU {result['cpu_s']:.2f}s, RSS {result['rss_kib']} KiB, peak {result['peak_rss_kib']} KiB")
+    print(f"{'stage':<48} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, row in result["stages"].items():
+        print(f"{name:<48} {row['count']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}")
+    for server, routes in sorted(result["requests"].items()):
+        print(f"{server}: " + ", ".join(f"{route}={count}" for route, count in sorted(routes.items())))
+
+def print_comparison(results, baseline):
+    print("\n--- Compared with baseline ---")
+    for number, (result, old) in enumerate(zip(results["passes"], baseline.get("passes", [])), 1):
+        def change(new_value, old_value):
+            if not old_value or new_value is None:
+                return "n/a"
+            return f"{(new_value - old_value) / old_value * 100:+.1f}%"
+        print(f"Pass {number}: jobs/sec {old.get('jobs_per_sec')} -> {result['jobs_per_sec']} ({change(result['jobs_per_sec'], old.get('jobs_per_sec'))}), "
+              f"CPU {old.get('cpu_s')}s -> {result['cpu_s']}s ({change(result['cpu_s'], old.get('cpu_s'))})")
+        for name, row in result["stages"].items():
+            old_row = old.get("stages", {}).get(name)
+            if old_row:
+                print(f"  {name:<46} p50 {old_row['p50_ms']:.2f} -> {row['p50_ms']:.2f} ms ({change(row['p50_ms'], old_row['p50_ms'])})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100, help="Distinct jobs listed across the search pages")
+    parser.add_argument("--passes", type=int, default=2, help="Crawls run back to back on the same state database")
+    parser.add_argument("--workers", type=int, default=4, help="CRAWL_WORKERS for the run")
+    parser.add_argument("--linkedin-latency", type=float, default=0.0, help="Milliseconds added to every LinkedIn response")
+    parser.add_argument("--wp-latency", type=float, default=0.0, help="Milliseconds added to every WordPress response")
+    parser.add_argument("--external-latency", type=float, default=0.0, help="Milliseconds added to every company/ATS response")
+    parser.add_argument("--linkedin-rate", type=float, default=1000.0, help="LINKEDIN_RATE; use 0.2 for production pacing")
+    parser.add_argument("--external-rate", type=float, default=1000.0, help="EXTERNAL_RATE")
+    parser.add_argument("--wordpress-rate", type=float, default=1000.0, help="WORDPRESS_RATE")
+    parser.add_argument("--async", dest="async_mode", action="store_true", help="Run crawl_async() (FETCHER_MODE=async) instead of crawl()")
+    parser.add_argument("--no-batch-route", action="store_true", help="Make the stub answer 404 on fetcher/v1/save-batch")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE", help="Extra fetcher environment setting, repeatable")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--compare", help="Print changes against a previous --json result")
+    parser.add_argument("--verbose", action="store_true", help="Keep fetcher's INFO logging and print output")
+    args = parser.parse_args()
+
+    invocation_dir = os.getcwd()
+    process, bases = start_stubs(args)
+    workdir = tempfile.mkdtemp(prefix="fetcher-bench-")
+    try:
+        os.environ.update({
+            "WP_SITE_URL": bases["wordpress"],
+            "LINKEDIN_BASE_URL": bases["linkedin"],
+            "WP_USERNAME": "bench",
+            "WP_APP_PASSWORD": "bench",
+            "COUNTRY": "France",
+            "KEYWORD": "data engineer",
+            "CRAWL_WORKERS": str(args.workers),
+            "LINKEDIN_RATE": str(args.linkedin_rate),
+            "LINKEDIN_JITTER": "0",
+            "EXTERNAL_RATE": str(args.external_rate),
+            "WORDPRESS_RATE": str(args.wordpress_rate),
+            "STATE_DB_FILE": os.path.join(workdir, "fetcher_state.db"),
+            "FETCHER_MODE": "async" if args.async_mode else "threads",
+        })
+        for setting in args.env:
+            name, _, value = setting.partition("=")
+            os.environ[name] = value
+        os.chdir(workdir)
+
+        import fetcher
+        import requests
+
+        if not args.verbose:
+            logging.disable(logging.CRITICAL)
+        recorder = Recorder()
+        instrument(fetcher, recorder, bases)
+        session = requests.Session()
+        auth_headers = {"Authorization": "Basic YmVuY2g6YmVuY2g="}
+
+        results = {
+            "settings": {k: v for k, v in vars(args).items() if k not in ("json", "compare", "verbose")},
+            "python": sys.version.split()[0],
+            "html_parser": fetcher.HTML_PARSER,
+            "passes": [],
+        }
+        counts = stub_stats(session, bases)
+        fetcher.parse_pool.start()
+        fetcher.status_watcher.start(auth_headers)
+        try:
+            for number in range(1, max(1, args.passes) + 1):
+                if args.verbose:
+                    result, counts = run_pass(fetcher, recorder, auth_headers, counts, session, bases)
+                else:
+                    with open(os.devnull, "w") as devnull:
+                        stdout, sys.stdout = sys.stdout, devnull
+                        try:
+                            result, counts = run_pass(fetcher, recorder, auth_headers, counts, session, bases)
+                        finally:
+                            sys.stdout = stdout
+                results["passes"].append(result)
+                print_pass(number, result)
+        finally:
+            fetcher.status_watcher.stop()
+            fetcher.parse_pool.shutdown()
+            fetcher.close_state_db()
+
+        if args.json:
+            with open(os.path.join(invocation_dir, args.json), "w") as f:
+                json.dump(results, f, indent=2)
+        if args.compare:
+            with open(os.path.join(invocation_dir, args.compare)) as f:
+                print_comparison(results, json.load(f))
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+if __name__ == "__main__":
+    main()
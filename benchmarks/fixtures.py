@@ -0,0 +1,54 @@
+"""Page templates modelled on LinkedIn's public guest markup and a typical ATS landing page.
+
+Templates use ``{{name}}`` placeholders so one fixture can stand in for many jobs and companies.
+"""
+import os
+import re
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+DEFAULT_VALUES = {
+    "base_url": "https://www.linkedin.com",
+    "job_id": "3791234567",
+    "index": "0",
+    "title": "Senior Data Engineer",
+    "title_slug": "senior-data-engineer",
+    "company": "Acme Analytics",
+    "company_slug": "acme-analytics",
+    "location": "Paris, Île-de-France, France",
+    "keyword": "data engineer",
+    "job_type": "Full-time",
+}
+
+_templates = {}
+
+def load_page(name):
+    """Return the raw template for a page (search, search_card, job, company or application)."""
+    if name not in _templates:
+        with open(os.path.join(PAGES_DIR, f"{name}.html"), encoding="utf-8") as f:
+            _templates[name] = f.read()
+    return _templates[name]
+
+def render_page(name, **values):
+    """Fill a page template, falling back to DEFAULT_VALUES for missing placeholders."""
+    merged = dict(DEFAULT_VALUES, **{k: str(v) for k, v in values.items()})
+    return re.sub(r"\{\{(\w+)\}\}", lambda m: merged.get(m.group(1), ""), load_page(name))
+
+def render_search_page(cards, **values):
+    """Render a search results page from a list of per-card placeholder dicts."""
+    rendered = "".join(render_page("search_card", **dict(values, index=i, **card)) for i, card in enumerate(cards))
+    return render_page("search", **dict(values, cards=rendered))
+
+def sample_cards(count=25, start=0):
+    """Build placeholder values for count distinct search result cards."""
+    cards = []
+    for n in range(start, start + count):
+        company_number = n % 7
+        cards.append({
+            "job_id": str(3791000000 + n),
+            "title": f"Data Engineer {n}",
+            "title_slug": f"data-engineer-{n}",
+            "company": f"Acme Analytics {company_number}",
+            "company_slug": f"acme-analytics-{company_number}",
+        })
+    return cards
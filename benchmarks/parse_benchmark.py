@@ -0,0 +1,104 @@
+"""Compare HTML parse time and peak memory per page across parser backends.
+
+Usage: python benchmarks/parse_benchmark.py [--repeat 20] [--json results.json]
+
+Every page is parsed as a full tree and restricted to the subtrees fetcher.py queries
+(PAGE_STRAINERS). The queried values are compared across variants so a backend or
+strainer that loses data is reported instead of silently looking fast.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fetcher  # noqa: E402
+from fixtures import render_page, render_search_page, sample_cards  # noqa: E402
+
+# Values read from each page by crawl(), scrape_job_details() and scrape_company_profile()
+PAGE_QUERIES = {
+    "search": ["#main-content > section > ul > li > div > a", ".base-search-card__title", ".base-search-card__subtitle"],
+    "job": [
+        "h1.top-card-layout__title",
+        "section.top-card-layout > div > a > img",
+        ".topcard__org-name-link",
+        ".topcard__flavor.topcard__flavor--bullet",
+        ".topcard__flavor--metadata",
+        ".description__job-criteria-list > li > span",
+        ".show-more-less-html__markup",
+        "#teriary-cta-container > div > a",
+    ],
+    "company": ["p.about-us__description", "section.core-section-container > div > p", "dl > div > dd"],
+    "application": ["a[href]"],
+}
+
+def build_pages():
+    return {
+        "search": render_search_page(sample_cards(25)),
+        "job": render_page("job"),
+        "company": render_page("company"),
+        "application": render_page("application"),
+    }
+
+def query_values(soup, page):
+    values = []
+    for selector in PAGE_QUERIES[page]:
+        for element in soup.select(selector):
+            values.append((selector, " ".join(element.get_text().split()), element.get("href") or element.get("data-delayed-url") or ""))
+    return values
+
+def measure(markup, page, parser, subtrees, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fetcher.parse_html(markup, page, parser=parser, subtrees=subtrees)
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    soup = fetcher.parse_html(markup, page, parser=parser, subtrees=subtrees)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "page": page,
+        "parser": parser,
+        "subtrees": subtrees,
+        "bytes": len(markup.encode("utf-8")),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(sorted(timings)[max(0, int(len(timings) * 0.95) - 1)], 3),
+        "peak_kib": round(peak / 1024, 1),
+        "values": query_values(soup, page),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="Write machine-readable results to this file")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    backends = ["html.parser"] + (["lxml"] if fetcher.HAS_LXML else [])
+    results = []
+    for page, markup in build_pages().items():
+        baseline = None
+        for backend in backends:
+            for subtrees in (False, True):
+                result = measure(markup, page, backend, subtrees, args.repeat)
+                values = result.pop("values")
+                if baseline is None:
+                    baseline = values
+                result["matches_baseline"] = values == baseline
+                results.append(result)
+
+    print(f"{'page':<12}{'parser':<13}{'subtrees':<10}{'KiB in':>8}{'median ms':>11}{'p95 ms':>9}{'peak KiB':>10}  same data")
+    for r in results:
+        print(f"{r['page']:<12}{r['parser']:<13}{str(r['subtrees']):<10}{r['bytes'] / 1024:>8.0f}{r['median_ms']:>11.2f}{r['p95_ms']:>9.2f}{r['peak_kib']:>10.0f}  {'yes' if r['matches_baseline'] else 'NO'}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"repeat": args.repeat, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
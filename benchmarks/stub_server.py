@@ -0,0 +1,299 @@
+"""Local stand-ins for LinkedIn, the WordPress REST API and external company/ATS sites.
+
+Usage: python benchmarks/stub_server.py [--jobs 100] [--linkedin-latency 0] [--wp-latency 0] [--external-latency 0]
+
+Three HTTP servers are started on 127.0.0.1 and their base URLs are printed as one JSON line
+on stdout. LinkedIn pages are rendered from the fixtures, WordPress implements the
+fetcher/v1/* (save and update-job), wp/v2/media, wp/v2/job-listings and taxonomy routes
+fetcher.py uses. HTML pages carry an ETag and answer If-None-Match with 304. GET /__stats on any server returns request
+counts per server and route, plus not_modified responses and bytes_sent.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import render_page, render_search_page, sample_cards  # noqa: E402
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 2048
+
+# Route names used in the request counts, matched against the path in order
+ROUTES = [
+    ("search", re.compile(r"^/jobs/search")),
+    ("job", re.compile(r"^/jobs/view/")),
+    ("company", re.compile(r"^/company/")),
+    ("apply_redirect", re.compile(r"^/externalApply/")),
+    ("application", re.compile(r"^/ats/")),
+    ("company_site", re.compile(r"^/sites/")),
+    ("logo", re.compile(r"^/media/logos/")),
+    ("fetcher_v1", re.compile(r"^/wp-json/fetcher/v1/([\w-]+)")),
+    ("wp_v2", re.compile(r"^/wp-json/wp/v2/([\w-]+)")),
+    ("not_modified", re.compile(r"^/__not_modified$")),
+]
+
+class StubState:
+    """Saved WordPress objects and request counters shared by all servers."""
+
+    def __init__(self, jobs, latency, batch_route=True):
+        self.jobs = jobs
+        self.latency = latency
+        self.batch_route = batch_route
+        self.counts = Counter()
+        self.companies = {}
+        self.job_posts = {}
+        self.media = []
+        self.terms = {}
+        self.bases = {}
+        self.lock = threading.Lock()
+
+    def count(self, server, path):
+        for name, pattern in ROUTES:
+            match = pattern.match(path)
+            if match:
+                route = f"{name}/{match.group(1)}" if match.groups() else name
+                break
+        else:
+            route = "other"
+        with self.lock:
+            self.counts[(server, route)] += 1
+
+    def count_bytes(self, server, size):
+        with self.lock:
+            self.counts[(server, "bytes_sent")] += size
+
+    def stats(self):
+        with self.lock:
+            result = {}
+            for (server, route), count in sorted(self.counts.items()):
+                result.setdefault(server, {})[route] = count
+            return result
+
+    def card(self, job_id):
+        """Return the fixture values of the search card whose LinkedIn ID is job_id."""
+        n = int(job_id) - 3791000000
+        if not 0 <= n < self.jobs:
+            return None
+        return sample_cards(1, start=n)[0]
+
+    def save_company(self, payload):
+        company_id = payload.get("company_id")
+        with self.lock:
+            if company_id in self.companies:
+                return {"company_id": company_id, "success": False, "message": "Company exists"}
+            self.companies[company_id] = payload
+        return {"company_id": company_id, "success": True, "message": "Company saved"}
+
+    def save_job(self, payload):
+        job_id = payload.get("job_id")
+        with self.lock:
+            if job_id in self.job_posts:
+                return {"job_id": job_id, "success": False, "message": "Job exists"}
+            post_id = len(self.job_posts) + 1
+            modified = time.strftime("%Y-%m-%dT%H:%M:%S")
+            self.job_posts[job_id] = dict(payload, id=post_id, link=f"{self.bases['wordpress']}/?p={post_id}", modified=modified)
+        return {"job_id": job_id, "success": True, "message": "Job saved"}
+
+    def update_job(self, payload):
+        job_id = payload.get("job_id")
+        with self.lock:
+            if job_id not in self.job_posts:
+                return {"job_id": job_id, "success": False, "message": "Job not found"}
+            self.job_posts[job_id].update(payload, modified=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        return {"job_id": job_id, "success": True, "message": "Job updated"}
+
+def make_handler(server_name, state):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def send(self, code, body=b"", content_type="text/html; charset=utf-8", extra_headers=None):
+            data = body.encode("utf-8") if isinstance(body, str) else body
+            if code == 200 and self.command == "GET" and content_type.startswith("text/html"):
+                # Pages are deterministic, so a content hash is a valid ETag for conditional requests
+                etag = f'"{hashlib.sha1(data).hexdigest()[:16]}"'
+                extra_headers = dict(extra_headers or {}, ETag=etag)
+                if self.headers.get("If-None-Match") == etag:
+                    code, data = 304, b""
+                    state.count(server_name, "/__not_modified")
+            state.count_bytes(server_name, len(data))
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (extra_headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(data)
+
+        def send_json(self, data, code=200, extra_headers=None):
+            self.send(code, json.dumps(data), "application/json", extra_headers)
+
+        def read_json(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return {}
+            try:
+                return json.loads(self.rfile.read(length))
+            except ValueError:
+                return {}
+
+        def do_GET(self):
+            self.handle_request()
+
+        def do_HEAD(self):
+            self.handle_request()
+
+        def do_POST(self):
+            self.handle_request(self.read_json())
+
+        def handle_request(self, body=None):
+            parsed = urlparse(self.path)
+            path = parsed.path
+            query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            if path == "/__stats":
+                return self.send_json(state.stats())
+            state.count(server_name, path)
+            if state.latency.get(server_name):
+                time.sleep(state.latency[server_name])
+            if path.startswith("/wp-json/"):
+                return self.wordpress(path, query, body)
+            return self.site(path, query)
+
+        def site(self, path, query):
+            linkedin = state.bases["linkedin"]
+            external = state.bases["external"]
+            if path.startswith("/jobs/search"):
+                start = int(query.get("start", "0") or 0)
+                cards = sample_cards(max(0, min(25, state.jobs - start)), start=start)
+                return self.send(200, render_search_page(cards, base_url=linkedin, keyword=query.get("keywords", "")))
+            match = re.match(r"^/jobs/view/.*?(\d+)$", path)
+            if match:
+                card = state.card(match.group(1))
+                if card is None:
+                    return self.send(404, "Not found")
+                return self.send(200, render_page("job", base_url=linkedin, **card))
+            match = re.match(r"^/company/([\w-]+)", path)
+            if match:
+                slug = match.group(1)
+                name = " ".join(part.capitalize() for part in slug.split("-"))
+                return self.send(200, render_page("company", base_url=external, company=name, company_slug=slug))
+            match = re.match(r"^/externalApply/(\d+)", path)
+            if match:
+                target = unquote(query.get("url", ""))
+                location = external + urlparse(target).path if target else f"{external}/ats/unknown/{match.group(1)}"
+                return self.send(302, extra_headers={"Location": location})
+            match = re.match(r"^/ats/([\w-]+)/(\d+)", path)
+            if match:
+                return self.send(200, render_page("application", base_url=external, company_slug=match.group(1), job_id=match.group(2)))
+            if path.startswith("/sites/"):
+                return self.send(200, "<html><head><title>Company site</title></head><body></body></html>")
+            if path.startswith("/media/logos/"):
+                return self.send(200, PNG_BYTES, "image/png")
+            return self.send(404, "Not found")
+
+        def wordpress(self, path, query, body):
+            route = path[len("/wp-json/"):].rstrip("/")
+            if route == "fetcher/v1/get-credentials":
+                return self.send_json({"success": True, "wp_username": "bench", "wp_app_password": "bench"})
+            if route == "fetcher/v1/get-status":
+                return self.send_json({"status": "running"})
+            if route == "fetcher/v1/save-company":
+                return self.send_json(state.save_company(body or {}))
+            if route == "fetcher/v1/save-job":
+                return self.send_json(state.save_job(body or {}))
+            if route == "fetcher/v1/update-job":
+                return self.send_json(state.update_job(body or {}))
+            if route == "fetcher/v1/save-batch" and state.batch_route:
+                body = body or {}
+                companies = [state.save_company(company) for company in body.get("companies", [])]
+                jobs = [state.save_job(job) for job in body.get("jobs", [])]
+                return self.send_json({"companies": companies, "jobs": jobs})
+            if route == "wp/v2/media":
+                if self.command == "POST":
+                    with state.lock:
+                        attachment_id = len(state.media) + 1
+                        filename = re.search(r'filename="?([^";]+)', self.headers.get("Content-Disposition", ""))
+                        item = {"id": attachment_id, "source_url": f"{state.bases['wordpress']}/uploads/{filename.group(1) if filename else attachment_id}"}
+                        state.media.append(item)
+                    return self.send_json(item, 201)
+                with state.lock:
+                    items = list(state.media)
+                return self.paginate([item for item in items if query.get("search", "") in item["source_url"]], query)
+            if route == "wp/v2/job-listings":
+                with state.lock:
+                    posts = list(state.job_posts.values())
+                search = query.get("search", "").lower()
+                company = query.get("meta_value")
+                modified_after = query.get("modified_after", "")
+                matches = [
+                    {"id": post["id"], "link": post["link"], "modified": post["modified"], "title": {"rendered": post.get("job_title", "")}, "meta": {"_company_name": post.get("company_name", "")}}
+                    for post in sorted(posts, key=lambda post: (post["modified"], post["id"]))
+                    if search in post.get("job_title", "").lower() and (company is None or post.get("company_name") == company)
+                    and post["modified"] > modified_after
+                ]
+                return self.paginate(matches, query)
+            match = re.match(r"^wp/v2/([\w-]+)$", route)
+            if match:
+                taxonomy = match.group(1)
+                with state.lock:
+                    terms = state.terms.setdefault(taxonomy, [])
+                    if self.command == "POST":
+                        term = {"id": sum(len(t) for t in state.terms.values()) + 1, "name": (body or {}).get("name", ""), "slug": (body or {}).get("slug", "")}
+                        terms.append(term)
+                    items = list(terms)
+                if self.command == "POST":
+                    return self.send_json(term, 201)
+                search = query.get("search", "").lower()
+                return self.paginate([term for term in items if search in term["name"].lower()], query)
+            return self.send_json({"code": "rest_no_route", "message": "No route was found matching the URL and request method."}, 404)
+
+        def paginate(self, items, query):
+            per_page = max(1, int(query.get("per_page", "10") or 10))
+            page = max(1, int(query.get("page", "1") or 1))
+            total_pages = max(1, -(-len(items) // per_page))
+            return self.send_json(items[(page - 1) * per_page:page * per_page], extra_headers={"X-WP-Total": str(len(items)), "X-WP-TotalPages": str(total_pages)})
+
+    return StubHandler
+
+def start_servers(jobs=100, linkedin_latency=0.0, wp_latency=0.0, external_latency=0.0, batch_route=True):
+    """Start the three stub servers in background threads; return (state, servers)."""
+    latency = {"linkedin": linkedin_latency, "wordpress": wp_latency, "external": external_latency}
+    state = StubState(jobs, latency, batch_route)
+    servers = {}
+    for name in ("linkedin", "wordpress", "external"):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(name, state))
+        server.daemon_threads = True
+        state.bases[name] = f"http://127.0.0.1:{server.server_port}"
+        threading.Thread(target=server.serve_forever, name=f"stub-{name}", daemon=True).start()
+        servers[name] = server
+    return state, servers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100, help="Distinct jobs listed across the search pages")
+    parser.add_argument("--linkedin-latency", type=float, default=0.0, help="Milliseconds added to every LinkedIn response")
+    parser.add_argument("--wp-latency", type=float, default=0.0, help="Milliseconds added to every WordPress response")
+    parser.add_argument("--external-latency", type=float, default=0.0, help="Milliseconds added to every company/ATS response")
+    parser.add_argument("--no-batch-route", action="store_true", help="Answer 404 on fetcher/v1/save-batch")
+    args = parser.parse_args()
+
+    state, _ = start_servers(args.jobs, args.linkedin_latency / 1000, args.wp_latency / 1000, args.external_latency / 1000, not args.no_batch_route)
+    print(json.dumps(state.bases), flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,48 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+import soupsieve
 import logging
 import time
 import re
 from urllib.parse import urljoin, urlparse, parse_qs, unquote
 import base64
+import html
+import unicodedata
 import json
 import hashlib
 import random
+import zlib
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import os
+import sys
+import threading
+import sqlite3
+import queue
+import signal
+import asyncio
+import functools
+import multiprocessing
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from dataclasses import dataclass, asdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import lxml  # noqa: F401  Optional, much faster HTML parser backend
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    import aiohttp  # Optional, only needed for FETCHER_MODE=async
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -23,10 +55,15 @@ headers = {
 
 # Get environment variables (from Service)
 WP_SITE_URL = os.getenv('WP_SITE_URL')  # Passed as input from plugin
+LINKEDIN_BASE_URL = os.getenv('LINKEDIN_BASE_URL', 'https://www.linkedin.com').rstrip('/')  # Overridden by the offline benchmarks
 WP_USERNAME = os.getenv('WP_USERNAME')  # Try environment variable first
 WP_APP_PASSWORD = os.getenv('WP_APP_PASSWORD')  # Try environment variable first
 COUNTRY = os.getenv('COUNTRY')  # Passed as input from plugin
 KEYWORD = os.getenv('KEYWORD', '')  # Passed as input from plugin, optional
+SEARCH_QUERIES = os.getenv('SEARCH_QUERIES', '')  # 'Country|keyword' pairs separated by ';' or newlines; overrides COUNTRY/KEYWORD
+SEARCH_PAGES = int(os.getenv('SEARCH_PAGES', '15'))  # Search result pages of 25 jobs crawled per query
+SEARCH_MAX_PAGES = int(os.getenv('SEARCH_MAX_PAGES', '40'))  # Pages a query may extend to while its pages keep yielding new jobs
+SEARCH_STALE_PAGES = int(os.getenv('SEARCH_STALE_PAGES', '2'))  # Consecutive pages without new jobs that end a query
 FETCHER_TOKEN = os.getenv('FETCHER_TOKEN', '')  # Optional for monetization/license check
 
 # Constants for WordPress
@@ -39,8 +76,11 @@ WP_SAVE_COMPANY_URL = f"{WP_SITE_URL}/wp-json/fetcher/v1/save-company"
 WP_SAVE_JOB_URL = f"{WP_SITE_URL}/wp-json/fetcher/v1/save-job"
 WP_FETCHER_STATUS_URL = f"{WP_SITE_URL}/wp-json/fetcher/v1/get-status"
 WP_CREDENTIALS_URL = f"{WP_SITE_URL}/wp-json/fetcher/v1/get-credentials"
+WP_SAVE_BATCH_URL = f"{WP_SITE_URL}/wp-json/fetcher/v1/save-batch"
+WP_UPDATE_JOB_URL = f"{WP_SITE_URL}/wp-json/fetcher/v1/update-job"
 PROCESSED_IDS_FILE = "processed_job_ids.csv"
-LAST_PAGE_FILE = "last_processed_page.txt"
+LAST_PAGE_FILE = "last_processed_page.txt"  # Legacy single-query checkpoint, migrated into the state database
+STATE_DB_FILE = os.getenv('STATE_DB_FILE', 'fetcher_state.db')  # SQLite file for caches that survive runs
 JOB_TYPE_MAPPING = {
     "Full-time": "full-time",
     "Part-time": "part-time",
@@ -60,6 +100,1311 @@ FRENCH_TO_ENGLISH_JOB_TYPE = {
     "Bénévolat": "Volunteer"
 }
 
+# Shared HTTP client settings
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '15'))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '50'))  # Number of hosts kept pooled
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))  # Keep-alive connections per host
+STATUS_POLL_INTERVAL = float(os.getenv('STATUS_POLL_INTERVAL', '5'))  # Seconds between background status polls
+
+# On-disk cache for company, website and application pages
+HTTP_CACHE_MAX_MB = float(os.getenv('HTTP_CACHE_MAX_MB', '50'))  # Compressed bodies kept in the state database; 0 disables it
+HTTP_CACHE_TTLS = {  # Hours a cached page is reused before it is revalidated, per kind of URL
+    'company': float(os.getenv('HTTP_CACHE_COMPANY_HOURS', '72')),
+    'website': float(os.getenv('HTTP_CACHE_WEBSITE_HOURS', '168')),
+    'application': float(os.getenv('HTTP_CACHE_APPLICATION_HOURS', '24'))
+}
+
+# Raw page archive replayed by "python fetcher.py reparse"
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', '')  # Directory of archived search, job, company, application and website responses; empty disables it
+ARCHIVE_SEGMENT_MB = float(os.getenv('ARCHIVE_SEGMENT_MB', '64'))  # Size at which a new segment file is started
+
+# Redirect resolution for application and company website URLs
+RESOLVER_TTL = float(os.getenv('RESOLVER_TTL_DAYS', '7')) * 86400  # How long a resolved destination is reused
+RESOLVER_BODY_BYTES = int(os.getenv('RESOLVER_BODY_BYTES', '131072'))  # Bytes of an application page read for emails and links
+RESOLVER_MAX_HOPS = 10
+
+# Concurrency and per-host politeness (requests per second)
+CRAWL_WORKERS = int(os.getenv('CRAWL_WORKERS', '4'))  # Default workers for the detail and enrichment stages
+DETAIL_WORKERS = int(os.getenv('DETAIL_WORKERS', str(CRAWL_WORKERS)))  # Job pages fetched and parsed in parallel
+ENRICH_WORKERS = int(os.getenv('ENRICH_WORKERS', str(CRAWL_WORKERS)))  # Application redirects and company pages
+MEDIA_WORKERS = int(os.getenv('MEDIA_WORKERS', '2'))  # Logo downloads and uploads
+PERSIST_WORKERS = int(os.getenv('PERSIST_WORKERS', str(CRAWL_WORKERS)))  # WordPress saves; a batch is shared by all workers
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '25'))  # Jobs buffered in front of each stage
+LINKEDIN_RATE = float(os.getenv('LINKEDIN_RATE', '0.2'))  # One request every 5 seconds across all workers
+LINKEDIN_JITTER = float(os.getenv('LINKEDIN_JITTER', '2'))  # Random extra seconds added to each LinkedIn wait
+EXTERNAL_RATE = float(os.getenv('EXTERNAL_RATE', '1'))  # Per external application/company domain
+WORDPRESS_RATE = float(os.getenv('WORDPRESS_RATE', '5'))
+
+# Adaptive rates and circuit breaker, driven by 429s, Retry-After and LinkedIn login/CAPTCHA redirects
+LINKEDIN_MAX_RATE = float(os.getenv('LINKEDIN_MAX_RATE', '0.5'))  # Ceiling the LinkedIn rate recovers to while requests succeed
+THROTTLE_BACKOFF = float(os.getenv('THROTTLE_BACKOFF', '0.5'))  # Rate multiplier applied on each throttle signal
+THROTTLE_RECOVERY = float(os.getenv('THROTTLE_RECOVERY', '1.25'))  # Rate multiplier applied after a run of successes
+THROTTLE_RECOVERY_REQUESTS = int(os.getenv('THROTTLE_RECOVERY_REQUESTS', '20'))  # Consecutive successes before the rate is raised
+CIRCUIT_BREAKER_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_THRESHOLD', '3'))  # Throttle signals in a row that pause a host
+CIRCUIT_BREAKER_PAUSE = float(os.getenv('CIRCUIT_BREAKER_PAUSE', '300'))  # Seconds of the first pause; doubles each time it reopens
+CIRCUIT_BREAKER_MAX_PAUSE = float(os.getenv('CIRCUIT_BREAKER_MAX_PAUSE', '3600'))
+CIRCUIT_BREAKER_MAX_OPENS = int(os.getenv('CIRCUIT_BREAKER_MAX_OPENS', '4'))  # Pauses without a success in between before requests give up
+
+# asyncio crawl mode
+FETCHER_MODE = os.getenv('FETCHER_MODE', 'threads')  # 'async' fetches LinkedIn and external pages with aiohttp
+ASYNC_CONCURRENCY = int(os.getenv('ASYNC_CONCURRENCY', '100'))  # Jobs in flight at once in async mode
+ASYNC_PARSE_WORKERS = int(os.getenv('ASYNC_PARSE_WORKERS', '4'))  # Threads parsing HTML off the event loop
+
+# Bulk saves to WordPress
+WP_BATCH_SIZE = int(os.getenv('WP_BATCH_SIZE', '10'))  # Jobs per bulk save; 0 saves every job immediately
+WP_BATCH_MAX_DELAY = float(os.getenv('WP_BATCH_MAX_DELAY', '30'))  # Seconds a buffered job may wait for its batch
+
+# HTML parsing
+HTML_PARSER = os.getenv('HTML_PARSER') or ('lxml' if HAS_LXML else 'html.parser')
+HTML_PARSE_SUBTREES = os.getenv('HTML_PARSE_SUBTREES', '1') != '0'  # Only build the parts of each page we query
+PARSE_PROCESSES = int(os.getenv('PARSE_PROCESSES', '0'))  # Worker processes extracting job/company pages; 0 parses in-process
+EXTRACTION_PROFILES_FILE = os.getenv('EXTRACTION_PROFILES_FILE', '')  # Optional JSON selector overrides
+EXTRACTION_PROFILE = os.getenv('EXTRACTION_PROFILE', '')  # Force a named profile instead of picking by locale
+
+# Company profile cache
+COMPANY_CACHE_TTL = float(os.getenv('COMPANY_CACHE_TTL_DAYS', '7')) * 86400
+COMPANY_CACHE_SIZE = int(os.getenv('COMPANY_CACHE_SIZE', '500'))  # Profiles kept in memory
+MEDIA_CACHE_SEED = os.getenv('MEDIA_CACHE_SEED', '') == '1'  # Re-read existing logos from the media library
+MEDIA_SEED_HASH_MAX = int(os.getenv('MEDIA_SEED_HASH_MAX', '200'))  # Older logos without a digest in their name downloaded and hashed per run, in the background
+JOB_INDEX_RESYNC = float(os.getenv('JOB_INDEX_RESYNC_DAYS', '7')) * 86400  # Full reload of the WordPress job listing index, dropping deleted posts
+PROCESSED_IDS_BATCH = int(os.getenv('PROCESSED_IDS_BATCH', '25'))  # Processed IDs buffered per commit
+JOURNAL_BATCH = int(os.getenv('JOURNAL_BATCH', '20'))  # Job journal entries buffered per commit
+JOB_REFRESH = float(os.getenv('JOB_REFRESH_DAYS', '0')) * 86400  # Re-scrape a processed job seen in search results after this long; 0 never does
+
+# Metrics export
+METRICS_FILE = os.getenv('METRICS_FILE', 'fetcher_metrics.json')  # JSON summary written at exit; empty disables it
+METRICS_PROM_FILE = os.getenv('METRICS_PROM_FILE', '')  # Optional Prometheus text-format file
+METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))  # Serve Prometheus text on /metrics when set
+METRICS_MAX_SAMPLES = 10000  # Per timer series; count, sum and max stay exact beyond this
+
+COMPANY_PROFILE_FIELDS = (
+    "company_details",
+    "company_website_url",
+    "company_industry",
+    "company_size",
+    "company_headquarters",
+    "company_type",
+    "company_founded",
+    "company_specialties"
+)
+
+class FetcherStopped(requests.exceptions.RequestException):
+    """Raised when a request is abandoned because the fetcher was stopped."""
+
+class Metrics:
+    """Thread-safe timers, counters and gauges with JSON and Prometheus text export."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._timers = {}
+            self._counters = {}
+            self._gauges = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            timer = self._timers.get(key)
+            if timer is None:
+                timer = self._timers[key] = {"count": 0, "sum": 0.0, "max": 0.0, "samples": []}
+            timer["count"] += 1
+            timer["sum"] += seconds
+            timer["max"] = max(timer["max"], seconds)
+            if len(timer["samples"]) < METRICS_MAX_SAMPLES:
+                timer["samples"].append(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - started, **labels)
+
+    def incr(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+
+    @staticmethod
+    def _quantile(ordered, q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+    def summary(self):
+        """Return {"timers", "counters", "gauges"}, each a mapping of metric name to a list of labelled series."""
+        with self._lock:
+            timers = {key: dict(value, samples=sorted(value["samples"])) for key, value in self._timers.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        result = {"timers": {}, "counters": {}, "gauges": {}}
+        for (name, labels), timer in sorted(timers.items()):
+            ordered = timer["samples"]
+            result["timers"].setdefault(name, []).append({
+                "labels": dict(labels),
+                "count": timer["count"],
+                "total_s": round(timer["sum"], 6),
+                "mean_ms": round(timer["sum"] / timer["count"] * 1000, 3),
+                "p50_ms": round(self._quantile(ordered, 0.5) * 1000, 3),
+                "p95_ms": round(self._quantile(ordered, 0.95) * 1000, 3),
+                "p99_ms": round(self._quantile(ordered, 0.99) * 1000, 3),
+                "max_ms": round(timer["max"] * 1000, 3)
+            })
+        for kind, values in (("counters", counters), ("gauges", gauges)):
+            for (name, labels), value in sorted(values.items()):
+                result[kind].setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return result
+
+    @staticmethod
+    def _labels(labels):
+        if not labels:
+            return ''
+        escaped = []
+        for k, v in labels.items():
+            value = str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            escaped.append(f'{k}="{value}"')
+        return '{' + ','.join(escaped) + '}'
+
+    def prometheus_text(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = []
+        if summary["timers"]:
+            lines.append("# HELP fetcher_stage_seconds Time spent per pipeline stage.")
+            lines.append("# TYPE fetcher_stage_seconds summary")
+            for name, series in summary["timers"].items():
+                for entry in series:
+                    labels = dict(stage=name, **entry["labels"])
+                    for quantile, field in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                        lines.append(f"fetcher_stage_seconds{self._labels(dict(labels, quantile=quantile))} {round(entry[field] / 1000, 6)}")
+                    lines.append(f"fetcher_stage_seconds_sum{self._labels(labels)} {entry['total_s']}")
+                    lines.append(f"fetcher_stage_seconds_count{self._labels(labels)} {entry['count']}")
+        for kind, suffix, prom_type in (("counters", "_total", "counter"), ("gauges", "", "gauge")):
+            for name, series in summary[kind].items():
+                lines.append(f"# TYPE fetcher_{name}{suffix} {prom_type}")
+                for entry in series:
+                    lines.append(f"fetcher_{name}{suffix}{self._labels(entry['labels'])} {entry['value']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        """Write the JSON summary and the Prometheus text file when configured."""
+        if METRICS_FILE:
+            try:
+                with open(METRICS_FILE, "w") as f:
+                    json.dump(self.summary(), f, indent=2)
+                logger.info(f"Wrote metrics summary to {METRICS_FILE}")
+            except OSError as e:
+                logger.error(f"Failed to write metrics to {METRICS_FILE}: {str(e)}")
+        if METRICS_PROM_FILE:
+            try:
+                with open(f"{METRICS_PROM_FILE}.tmp", "w") as f:
+                    f.write(self.prometheus_text())
+                os.replace(f"{METRICS_PROM_FILE}.tmp", METRICS_PROM_FILE)
+                logger.info(f"Wrote Prometheus metrics to {METRICS_PROM_FILE}")
+            except OSError as e:
+                logger.error(f"Failed to write Prometheus metrics to {METRICS_PROM_FILE}: {str(e)}")
+
+    def serve(self, port):
+        """Serve /metrics in Prometheus text format from a daemon thread."""
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('', port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info(f"Serving Prometheus metrics on port {port}")
+        return server
+
+    def log_summary(self):
+        """Print a per-stage timing table and the HTTP counters."""
+        summary = self.summary()
+        print("\n--- Timings ---")
+        for name, series in summary["timers"].items():
+            for entry in series:
+                label = ','.join(f"{k}={v}" for k, v in entry["labels"].items())
+                stage = f"{name}[{label}]" if label else name
+                print(f"{stage}: {entry['count']} x {entry['mean_ms']:.0f} ms (p95 {entry['p95_ms']:.0f} ms, total {entry['total_s']:.1f}s)")
+        for name in ("http_requests", "http_retries", "http_429", "http_throttled", "circuit_breaker_open"):
+            for entry in summary["counters"].get(name, []):
+                label = ','.join(f"{k}={v}" for k, v in entry["labels"].items())
+                print(f"{name}[{label}]: {entry['value']}")
+
+metrics = Metrics()
+
+class TokenBucket:
+    """Thread-safe token bucket; each acquire reserves the next free slot.
+
+    The rate adapts to the host: throttle() cuts it by THROTTLE_BACKOFF and honours Retry-After,
+    and every THROTTLE_RECOVERY_REQUESTS successes raise it by THROTTLE_RECOVERY up to max_rate.
+    CIRCUIT_BREAKER_THRESHOLD throttles in a row open the circuit, pausing the host for
+    CIRCUIT_BREAKER_PAUSE, doubled for each reopening without a success in between.
+    Jitter is reserved along with the token, so consecutive slots are never closer than 1/rate.
+    """
+
+    def __init__(self, rate, capacity=1, jitter=0.0, max_rate=None):
+        self.rate = rate
+        self.min_rate = rate / 8  # Longer outages are left to the circuit breaker
+        self.max_rate = max(rate, max_rate or rate)
+        self.capacity = capacity
+        self.jitter = jitter
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.successes = 0
+        self.strikes = 0
+        self.opens = 0
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _set_rate(self, rate):
+        rate = min(self.max_rate, max(self.min_rate, rate))
+        if self.tokens < 0:
+            # Keep the wait already promised to queued callers
+            self.tokens *= rate / self.rate
+        self.rate = rate
+
+    def reserve(self):
+        """Take a token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            self._refill()
+            self.tokens -= 1
+            if self.jitter:
+                self.tokens -= random.uniform(0, self.jitter) * self.rate
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def success(self):
+        """Record a request the host accepted; return True when the rate was raised."""
+        with self._lock:
+            self.strikes = 0
+            self.opens = 0
+            self.successes += 1
+            if self.successes < THROTTLE_RECOVERY_REQUESTS or self.rate >= self.max_rate:
+                return False
+            self.successes = 0
+            self._refill()
+            self._set_rate(self.rate * THROTTLE_RECOVERY)
+            return True
+
+    def throttle(self, retry_after=None):
+        """Slow down after a throttle signal; return the seconds the host is paused when the circuit opens, else 0."""
+        with self._lock:
+            self._refill()
+            self.successes = 0
+            self.strikes += 1
+            self._set_rate(self.rate * THROTTLE_BACKOFF)
+            pause = 0.0
+            if self.strikes >= CIRCUIT_BREAKER_THRESHOLD:
+                pause = min(CIRCUIT_BREAKER_MAX_PAUSE, CIRCUIT_BREAKER_PAUSE * 2 ** self.opens)
+                self.strikes = 0
+                self.opens += 1
+            wait = min(CIRCUIT_BREAKER_MAX_PAUSE, max(pause, retry_after or 0))
+            # Owe the wait in tokens so the next slot starts no sooner than that
+            self.tokens = min(self.tokens, -wait * self.rate)
+            self.paused_until = max(self.paused_until, time.monotonic() + wait)
+            return pause
+
+    def paused(self):
+        """True while the host's last throttle signal is being waited out."""
+        return time.monotonic() < self.paused_until
+
+    def give_up(self):
+        """Drop the pause owed after the limiter gave up on a request, so later requests are not held back by it."""
+        with self._lock:
+            self._refill()
+            self.tokens = max(self.tokens, 0.0)
+            self.paused_until = 0.0
+
+    def acquire(self, cancel_event=None):
+        """Block until a token is available; return False if cancel_event fires first."""
+        delay = self.reserve()
+        if delay <= 0:
+            return True
+        if cancel_event is not None:
+            return not cancel_event.wait(delay)
+        time.sleep(delay)
+        return True
+
+    async def acquire_async(self, cancel_event=None):
+        """asyncio version of acquire() that sleeps without blocking the event loop."""
+        delay = self.reserve()
+        deadline = time.monotonic() + delay
+        while delay > 0:
+            if cancel_event is not None and cancel_event.is_set():
+                return False
+            await asyncio.sleep(min(delay, 0.25))
+            delay = deadline - time.monotonic()
+        return True
+
+class HostRateLimiter:
+    """One token bucket per host: linkedin.com, the WordPress site and each external domain."""
+
+    def __init__(self, linkedin_rate=LINKEDIN_RATE, external_rate=EXTERNAL_RATE, wordpress_rate=WORDPRESS_RATE):
+        self.linkedin_rate = linkedin_rate
+        self.external_rate = external_rate
+        self.wordpress_rate = wordpress_rate
+        self.wordpress_host = (urlparse(WP_SITE_URL or '').hostname or '').lower()
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def host_key(self, url):
+        host = (urlparse(url).hostname or '').lower()
+        if host == 'linkedin.com' or host.endswith('.linkedin.com'):
+            return 'linkedin.com'
+        if host.startswith('www.'):
+            host = host[4:]
+        return host
+
+    def is_wordpress(self, key):
+        return bool(self.wordpress_host) and key == self.wordpress_host.removeprefix('www.')
+
+    def bucket(self, key):
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if key == 'linkedin.com':
+                    bucket = TokenBucket(self.linkedin_rate, jitter=LINKEDIN_JITTER, max_rate=LINKEDIN_MAX_RATE)
+                elif self.is_wordpress(key):
+                    bucket = TokenBucket(self.wordpress_rate, capacity=max(1, int(self.wordpress_rate)))
+                else:
+                    bucket = TokenBucket(self.external_rate)
+                self._buckets[key] = bucket
+            return bucket
+
+    def _cancel_event(self, key, bucket):
+        # Saves can finish after a stop, unless WordPress itself asked for a pause
+        if self.is_wordpress(key) and not bucket.paused():
+            return None
+        return status_watcher.cancelled
+
+    def acquire(self, url):
+        """Wait for the host's next slot; a stop cancels the wait, except for WordPress slots outside a throttle pause."""
+        key = self.host_key(url)
+        bucket = self.bucket(key)
+        if not bucket.acquire(self._cancel_event(key, bucket)):
+            raise FetcherStopped(f"Fetcher stopped while waiting to request {url}")
+
+    async def acquire_async(self, url):
+        key = self.host_key(url)
+        bucket = self.bucket(key)
+        if not await bucket.acquire_async(self._cancel_event(key, bucket)):
+            raise FetcherStopped(f"Fetcher stopped while waiting to request {url}")
+
+    def feedback(self, url, response):
+        """Adapt the host's rate to a response; return True when the request should be sent again after the next wait."""
+        key = self.host_key(url)
+        bucket = self.bucket(key)
+        if response.status_code == 429:
+            reason = '429'
+            metrics.incr('http_429', host=key)
+        elif is_challenge(response.url):
+            reason = 'challenge'
+        else:
+            if bucket.success():
+                metrics.gauge('host_rate', bucket.rate, host=key)
+                logger.info(f"Requests to {key} succeeding, raising rate to one every {1 / bucket.rate:.1f}s")
+            return False
+        metrics.incr('http_throttled', host=key, reason=reason)
+        pause = bucket.throttle(retry_after_seconds(response.headers.get('Retry-After')))
+        metrics.gauge('host_rate', bucket.rate, host=key)
+        if not pause:
+            logger.warning(f"Got {reason} from {key}, slowing to one request every {1 / bucket.rate:.1f}s")
+            return True
+        metrics.incr('circuit_breaker_open', host=key)
+        if bucket.opens > CIRCUIT_BREAKER_MAX_OPENS:
+            logger.error(f"{key} still answers {reason} after {CIRCUIT_BREAKER_MAX_OPENS} pauses, giving up on {url}")
+            bucket.give_up()
+            return False
+        logger.warning(f"Repeated {reason} from {key}, pausing requests to it for {pause:.0f}s")
+        return True
+
+def retry_after_seconds(value):
+    """Return the seconds a Retry-After header asks to wait, or None."""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def is_challenge(url):
+    """True when LinkedIn sent the request to a login, authwall or CAPTCHA page."""
+    path = urlparse(url).path
+    return rate_limiter.host_key(url) == 'linkedin.com' and any(marker in path for marker in ('/login', '/authwall', '/checkpoint', 'challenge'))
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that keeps connection counters of pools evicted from the pool manager."""
+
+    def __init__(self, *args, on_pool_dispose=None, **kwargs):
+        self.on_pool_dispose = on_pool_dispose
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        pools = self.poolmanager.pools
+        dispose = pools.dispose_func
+
+        def dispose_pool(pool):
+            if self.on_pool_dispose:
+                self.on_pool_dispose(pool)
+            if dispose:
+                dispose(pool)
+
+        pools.dispose_func = dispose_pool
+
+class CountingRetry(Retry):
+    """urllib3 Retry that counts retries per host; 429s are left to the adaptive rate limiter."""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        host = rate_limiter.host_key(f"http://{_pool.host}") if _pool is not None else ''
+        new_retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        metrics.incr('http_retries', host=host)
+        return new_retry
+
+class HttpCache:
+    """Compressed GET responses in the state database, revalidated with ETag/Last-Modified once their TTL passes.
+
+    Only requests made with cache=<kind> are looked up, and only 200 responses without
+    Cache-Control: no-store are stored. When the compressed bodies exceed HTTP_CACHE_MAX_MB the
+    least recently used pages are evicted.
+    """
+
+    STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+    def __init__(self, max_bytes=HTTP_CACHE_MAX_MB * 1024 * 1024, ttls=HTTP_CACHE_TTLS):
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self._size = None
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _db(self):
+        db = get_state_db()
+        if self._size is None:
+            db.execute("CREATE TABLE IF NOT EXISTS http_cache (url TEXT PRIMARY KEY, kind TEXT NOT NULL, final_url TEXT NOT NULL, "
+                       "headers TEXT NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL, fetched_at REAL NOT NULL, used_at REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS http_cache_used_at ON http_cache (used_at)")
+            self._size = db.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        return db
+
+    def lookup(self, url, kind):
+        """Return (entry, fresh) for a cached URL, or (None, False)."""
+        try:
+            with state_db_lock:
+                row = self._db().execute("SELECT final_url, headers, body, fetched_at FROM http_cache WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None, False
+            entry = {"url": row[0], "headers": json.loads(row[1]), "body": zlib.decompress(row[2])}
+        except (sqlite3.Error, ValueError, zlib.error) as e:
+            logger.error(f"Failed to read cached response for {url}: {str(e)}")
+            return None, False
+        return entry, time.time() - row[3] < self.ttls.get(kind, 0) * 3600
+
+    @staticmethod
+    def validators(entry):
+        """Conditional request headers for a stale entry."""
+        conditions = {}
+        if entry["headers"].get('ETag'):
+            conditions['If-None-Match'] = entry["headers"]['ETag']
+        if entry["headers"].get('Last-Modified'):
+            conditions['If-Modified-Since'] = entry["headers"]['Last-Modified']
+        return conditions
+
+    def touch(self, url, revalidated=False):
+        """Mark an entry as used; a 304 also restarts its TTL."""
+        now = time.time()
+        try:
+            with state_db_lock:
+                db = self._db()
+                if revalidated:
+                    db.execute("UPDATE http_cache SET used_at = ?, fetched_at = ? WHERE url = ?", (now, now, url))
+                else:
+                    db.execute("UPDATE http_cache SET used_at = ? WHERE url = ?", (now, url))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to update cached response for {url}: {str(e)}")
+
+    def store(self, url, kind, final_url, response_headers, body):
+        if 'no-store' in (response_headers.get('Cache-Control') or '').lower():
+            return
+        stored_headers = {name: response_headers[name] for name in self.STORED_HEADERS if response_headers.get(name)}
+        data = zlib.compress(body)
+        now = time.time()
+        try:
+            with state_db_lock:
+                db = self._db()
+                previous = db.execute("SELECT size FROM http_cache WHERE url = ?", (url,)).fetchone()
+                db.execute("INSERT OR REPLACE INTO http_cache (url, kind, final_url, headers, body, size, fetched_at, used_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (url, kind, final_url, json.dumps(stored_headers), data, len(data), now, now))
+                self._size += len(data) - (previous[0] if previous else 0)
+                self._evict(db)
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to cache response for {url}: {str(e)}")
+
+    def _evict(self, db):
+        if self._size <= self.max_bytes:
+            return
+        evicted = 0
+        for url, size in db.execute("SELECT url, size FROM http_cache ORDER BY used_at").fetchall():
+            if self._size <= self.max_bytes * 0.9:
+                break
+            db.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            self._size -= size
+            evicted += 1
+        metrics.incr('http_cache_evictions', evicted)
+        logger.info(f"Evicted {evicted} cached responses, {self._size // 1024} KiB left")
+
+    @staticmethod
+    def response(entry):
+        """Rebuild a requests.Response from a cache entry."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response.headers = requests.structures.CaseInsensitiveDict(entry["headers"])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = entry["body"]
+        return response
+
+http_cache = HttpCache()
+
+class PageArchive:
+    """Append-only archive of raw search, job, company, application, website and logo responses for offline re-parsing.
+
+    Bodies are zlib-compressed and appended to segment-NNNNN.bin files in ARCHIVE_DIR; index.db
+    maps each URL and fetch time to its segment, offset and length, with the status, final URL
+    and the headers replay needs. A response identical to the URL's latest archived copy is not
+    written again. While replaying (the reparse command), HttpClient answers every non-WordPress
+    request from here, so nothing reaches LinkedIn or the external sites.
+    """
+
+    STAGES = {'search_page_fetch': 'search', 'detail_fetch': 'job', 'company_page_fetch': 'company',
+              'application_resolve': 'application', 'website_resolve': 'website', 'logo_download': 'logo'}
+    STORED_HEADERS = ('Content-Type', 'Location')
+
+    def __init__(self, directory=ARCHIVE_DIR, segment_mb=ARCHIVE_SEGMENT_MB):
+        self.directory = directory
+        self.segment_bytes = int(segment_mb * 1024 * 1024)
+        self.replaying = False
+        self._db = None
+        self._segment = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.directory)
+
+    def _index(self):
+        if self._db is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.directory, 'index.db'), check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS pages (id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, url TEXT NOT NULL, "
+                             "fetched_at REAL NOT NULL, status INTEGER NOT NULL, final_url TEXT NOT NULL, headers TEXT NOT NULL, "
+                             "digest TEXT NOT NULL, segment INTEGER NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (url, fetched_at)")
+        return self._db
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f"segment-{number:05d}.bin")
+
+    def _open_segment(self, size):
+        """Return (number, file) of the segment a record of size bytes is appended to."""
+        if self._segment is None:
+            number = self._index().execute("SELECT MAX(segment) FROM pages").fetchone()[0] or 1
+            self._segment = (number, open(self._segment_path(number), 'ab'))
+        number, handle = self._segment
+        if handle.tell() and handle.tell() + size > self.segment_bytes:
+            handle.close()
+            self._segment = (number + 1, open(self._segment_path(number + 1), 'ab'))
+        return self._segment
+
+    def archives(self, stage):
+        """True when responses of stage are written to the archive."""
+        return stage in self.STAGES and self.enabled and not self.replaying
+
+    def record(self, stage, url, response):
+        """Archive the response of a GET or HEAD made for one of the archived stages."""
+        if not self.archives(stage):
+            return
+        kind = self.STAGES[stage]
+        body = response.content
+        digest = hashlib.sha1(body).hexdigest()
+        stored_headers = {name: response.headers[name] for name in self.STORED_HEADERS if response.headers.get(name)}
+        data = zlib.compress(body)
+        try:
+            with self._lock:
+                db = self._index()
+                latest = db.execute("SELECT digest, status FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)).fetchone()
+                if latest == (digest, response.status_code):
+                    return
+                number, handle = self._open_segment(len(data))
+                offset = handle.tell()
+                handle.write(data)
+                handle.flush()
+                db.execute("INSERT INTO pages (kind, url, fetched_at, status, final_url, headers, digest, segment, offset, length) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                           (kind, url, time.time(), response.status_code, str(response.url), json.dumps(stored_headers), digest, number, offset, len(data)))
+                db.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Failed to archive {url}: {str(e)}")
+
+    def response(self, url):
+        """Return the latest archived response for url; raise ConnectionError when it was never archived."""
+        with self._lock:
+            row = self._index().execute("SELECT status, final_url, headers, segment, offset, length FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1",
+                                        (url,)).fetchone()
+        if row is None:
+            raise requests.exceptions.ConnectionError(f"{url} is not in the page archive")
+        status, final_url, stored_headers, number, offset, length = row
+        with open(self._segment_path(number), 'rb') as handle:
+            handle.seek(offset)
+            body = zlib.decompress(handle.read(length))
+        response = http_cache.response({"url": final_url, "headers": json.loads(stored_headers), "body": body})
+        response.status_code = status
+        return response
+
+    def urls(self, kind):
+        """Return the distinct archived URLs of a kind, in the order they were first fetched."""
+        with self._lock:
+            return [row[0] for row in self._index().execute("SELECT url FROM pages WHERE kind = ? GROUP BY url ORDER BY MIN(id)", (kind,))]
+
+    def close(self):
+        with self._lock:
+            if self._segment is not None:
+                self._segment[1].close()
+                self._segment = None
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+page_archive = PageArchive()
+
+def read_limited(response, max_bytes):
+    """Read at most max_bytes of a streamed response body; a connection is only given up when bytes were left unread."""
+    body = bytearray()
+    for chunk in response.iter_content(16384):
+        body.extend(chunk)
+        if len(body) >= max_bytes:
+            response.close()
+            break
+    response._content = bytes(body[:max_bytes])
+    response._content_consumed = True
+
+class HttpClient:
+    """One pooled session for all LinkedIn, external and WordPress traffic."""
+
+    def __init__(self, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES, pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE):
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = CountingRetry(total=retries, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+        self.adapter = PooledHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+            on_pool_dispose=self._record_disposed_pool
+        )
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self._lock = threading.Lock()
+        self._disposed_stats = {}
+
+    def request(self, method, url, stage=None, cache=None, **kwargs):
+        """Send a request after the host's rate-limit wait; stage names the timer the request is recorded under.
+
+        cache names the HttpCache TTL class of a GET whose response may come from, or be revalidated against, disk.
+        Responses of the archived stages are written to the page archive, and answered from it while replaying.
+        """
+        if page_archive.replaying and not rate_limiter.is_wordpress(rate_limiter.host_key(url)):
+            return page_archive.response(url)
+        response = self._cached(method, url, stage, cache, **kwargs)
+        if method.upper() in ('GET', 'HEAD'):
+            page_archive.record(stage, url, response)
+        return response
+
+    def _cached(self, method, url, stage, cache, **kwargs):
+        if not cache or method.upper() != 'GET' or not http_cache.enabled:
+            return self._send(method, url, stage, **kwargs)
+        entry, fresh = http_cache.lookup(url, cache)
+        if fresh:
+            http_cache.touch(url)
+            metrics.incr('http_cache', result='hit', kind=cache)
+            return http_cache.response(entry)
+        if entry is not None:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **http_cache.validators(entry))
+        response = self._send(method, url, stage, **kwargs)
+        if entry is not None and response.status_code == 304:
+            http_cache.touch(url, revalidated=True)
+            metrics.incr('http_cache', result='revalidated', kind=cache)
+            return http_cache.response(entry)
+        metrics.incr('http_cache', result='miss', kind=cache)
+        if response.status_code == 200:
+            http_cache.store(url, cache, response.url, response.headers, response.content)
+        return response
+
+    def _send(self, method, url, stage=None, max_bytes=None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        if max_bytes:
+            kwargs['stream'] = True
+        host = rate_limiter.host_key(url)
+        while True:
+            with metrics.timer('rate_limit_wait', host=host):
+                rate_limiter.acquire(url)
+            status = 'error'
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+                status = response.status_code
+                if max_bytes:
+                    read_limited(response, max_bytes)
+            finally:
+                metrics.incr('http_requests', host=host, status=status)
+                if stage:
+                    metrics.observe(stage, time.monotonic() - started)
+            if not rate_limiter.feedback(url, response):
+                return response
+            response.close()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+
+    def _record_disposed_pool(self, pool):
+        with self._lock:
+            totals = self._disposed_stats.setdefault(pool.host, {'requests': 0, 'connections': 0})
+            totals['requests'] += pool.num_requests
+            totals['connections'] += pool.num_connections
+
+    def connection_stats(self):
+        """Return per-host request, new connection and reused connection counts."""
+        with self._lock:
+            stats = {host: dict(totals) for host, totals in self._disposed_stats.items()}
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            totals = stats.setdefault(pool.host, {'requests': 0, 'connections': 0})
+            totals['requests'] += pool.num_requests
+            totals['connections'] += pool.num_connections
+        for totals in stats.values():
+            totals['reused'] = max(totals['requests'] - totals['connections'], 0)
+        return stats
+
+    def log_connection_stats(self):
+        """Log and print how many requests reused a pooled connection, per host."""
+        stats = self.connection_stats()
+        print("\n--- Connections ---")
+        for host, totals in sorted(stats.items()):
+            logger.info(f"Connection stats for {host}: {totals['requests']} requests, {totals['connections']} new connections, {totals['reused']} reused")
+            print(f"{host}: {totals['requests']} requests over {totals['connections']} connections ({totals['reused']} reused)")
+        return stats
+
+    def close(self):
+        self.session.close()
+
+rate_limiter = HostRateLimiter()
+http_client = HttpClient()
+
+def subtree_strainer(classes=(), ids=(), names=()):
+    """Build a SoupStrainer keeping only top-level elements with one of the given classes, ids or tag names."""
+    classes = set(classes)
+
+    def keep(name, attrs):
+        if name in names or attrs.get('id') in ids:
+            return True
+        class_attr = attrs.get('class') or ''
+        if isinstance(class_attr, list):
+            class_attr = ' '.join(class_attr)
+        return bool(classes.intersection(class_attr.split()))
+
+    return SoupStrainer(keep)
+
+# Subtrees queried on each kind of page; everything else is skipped during parsing
+PAGE_STRAINERS = {
+    "search": subtree_strainer(ids=("main-content",)),
+    "job": subtree_strainer(
+        classes=("top-card-layout", "description__job-criteria-list", "show-more-less-html__markup"),
+        ids=("teriary-cta-container",)
+    ),
+    "company": subtree_strainer(classes=("about-us__description", "core-section-container"), names=("dl",)),
+    "application": SoupStrainer("a")
+}
+
+def parse_html(markup, page=None, parser=None, subtrees=None):
+    """Parse markup with the configured backend, restricted to the page's queried subtrees when enabled."""
+    parser = parser or HTML_PARSER
+    subtrees = HTML_PARSE_SUBTREES if subtrees is None else subtrees
+    strainer = PAGE_STRAINERS.get(page) if subtrees else None
+    with metrics.timer('html_parse', page=page or 'full'):
+        return BeautifulSoup(markup, parser, parse_only=strainer)
+
+class FieldRule:
+    """How to extract one field: CSS selectors in priority order, the attribute to read and a post-processor.
+
+    attr is None for the element's stripped text, an attribute name (or a tuple of names tried in
+    order), or 'element' for the element itself. many=True collects every match as a list.
+    """
+
+    def __init__(self, selectors, attr=None, post=None, many=False, default=''):
+        self.selectors = (selectors,) if isinstance(selectors, str) else tuple(selectors)
+        self.attr = attr
+        self.post = post
+        self.many = many
+        self.default = default
+
+    def with_selectors(self, selectors, attr=None):
+        return FieldRule(selectors, attr if attr is not None else self.attr, self.post, self.many, self.default)
+
+    def with_post(self, post):
+        return FieldRule(self.selectors, self.attr, post, self.many, self.default)
+
+    def value_of(self, element):
+        if self.attr is None:
+            return element.get_text().strip()
+        if self.attr == 'element':
+            return element
+        for name in ((self.attr,) if isinstance(self.attr, str) else self.attr):
+            value = element.get(name)
+            if value:
+                return value
+        return ''
+
+    def evaluate(self, matches):
+        if self.many:
+            value = [self.value_of(element) for element in matches]
+        else:
+            value = self.value_of(matches[0]) if matches else None
+            if value is None:
+                value = self.default() if callable(self.default) else self.default
+        return self.post(value) if self.post else value
+
+def mask_selector_arguments(selector):
+    """Replace everything inside brackets, parentheses and quotes with NULs, keeping the top-level structure."""
+    masked = []
+    closers = []
+    quote = None
+    for char in selector:
+        if quote:
+            masked.append('\0')
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+            masked.append('\0')
+        elif char in '([':
+            masked.append('\0' if closers else char)
+            closers.append(')' if char == '(' else ']')
+        elif closers and char == closers[-1]:
+            closers.pop()
+            masked.append('\0' if closers else char)
+        else:
+            masked.append('\0' if closers else char)
+    return ''.join(masked)
+
+def selector_index_keys(selector):
+    """Return the ('tag', name) or ('class', name) keys of the last compound of each alternative of a selector.
+
+    None means some alternative has neither (e.g. *, #id or a bare :is(...)) or the selector uses
+    escapes, so it has to be tried against every element.
+    """
+    if '\\' in selector:
+        return None
+    keys = []
+    for alternative in mask_selector_arguments(selector).split(','):
+        last = re.split(r'\s*[>+~]\s*|\s+', alternative.strip())[-1]
+        tag = re.match(r'[a-zA-Z][\w-]*', last)
+        classes = re.findall(r'\.([\w-]+)', last)
+        if tag:
+            keys.append(('tag', tag.group(0).lower()))
+        elif classes:
+            keys.append(('class', classes[0]))
+        else:
+            return None
+    return list(dict.fromkeys(keys))
+
+class ExtractionProfile:
+    """Field rules compiled once and evaluated in a single walk over a parsed page."""
+
+    def __init__(self, name, rules):
+        self.name = name
+        self.rules = dict(rules)
+        self._by_tag = {}
+        self._by_class = {}
+        self._generic = []
+        self._multi_keyed = False
+        for field, rule in self.rules.items():
+            for priority, selector in enumerate(rule.selectors):
+                entry = (field, priority, rule.many, soupsieve.compile(selector))
+                keys = selector_index_keys(selector)
+                if keys is None:
+                    self._generic.append(entry)
+                    continue
+                self._multi_keyed = self._multi_keyed or len(keys) > 1
+                for kind, name in keys:
+                    index = self._by_tag if kind == 'tag' else self._by_class
+                    index.setdefault(name, []).append(entry)
+
+    def derive(self, name, **rules):
+        """Return a copy of this profile with some field rules replaced or added."""
+        return ExtractionProfile(name, dict(self.rules, **rules))
+
+    def extract(self, soup):
+        """Return {field: value} for every rule, visiting each element of the tree once."""
+        matches = {}
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            candidates = self._by_tag.get(element.name, [])
+            for class_name in element.get('class') or ():
+                candidates = candidates + self._by_class.get(class_name, [])
+            if self._multi_keyed:
+                # A selector indexed under several keys is tried once per element
+                candidates = list(dict.fromkeys(candidates))
+            for field, priority, many, matcher in candidates + self._generic:
+                found = matches.setdefault((field, priority), [])
+                if (many or not found) and matcher.match(element):
+                    found.append(element)
+        result = {}
+        for field, rule in self.rules.items():
+            chosen = []
+            for priority in range(len(rule.selectors)):
+                chosen = matches.get((field, priority)) or []
+                if chosen:
+                    break
+            result[field] = rule.evaluate(chosen)
+        return result
+
+def strip_query(url):
+    return re.sub(r'\?.*$', '', url) if url else ''
+
+def deduplicate_location(location):
+    location_parts = [part.strip() for part in (location or '').split(',') if part.strip()]
+    return ', '.join(dict.fromkeys(location_parts))
+
+def pick_work_environment(flavors):
+    for text in flavors:
+        lowered = text.lower()
+        if 'remote' in lowered or 'hybrid' in lowered or 'on-site' in lowered:
+            return text
+    return ''
+
+def job_type_translator(*mappings):
+    """Post-processor mapping localized employment types to the English names in JOB_TYPE_MAPPING."""
+    merged = {}
+    for mapping in mappings:
+        merged.update(mapping)
+    return lambda job_type: merged.get(job_type, job_type)
+
+# Localized employment type labels per LinkedIn locale subdomain
+JOB_TYPE_TRANSLATIONS = {
+    "fr": FRENCH_TO_ENGLISH_JOB_TYPE
+}
+
+JOB_PAGE_PROFILE = ExtractionProfile("default", {
+    "job_title": FieldRule("h1.top-card-layout__title"),
+    "company_logo": FieldRule("section.top-card-layout > div > a > img", attr=("data-delayed-url", "src")),
+    "company_name": FieldRule(".topcard__org-name-link"),
+    "company_url": FieldRule(".topcard__org-name-link", attr="href", post=strip_query),
+    "location": FieldRule(".topcard__flavor.topcard__flavor--bullet", post=deduplicate_location),
+    "environment": FieldRule(".topcard__flavor--metadata", many=True, post=pick_work_environment),
+    "level": FieldRule(".description__job-criteria-list > li:nth-child(1) > span"),
+    "job_type": FieldRule(".description__job-criteria-list > li:nth-child(2) > span", post=job_type_translator(*JOB_TYPE_TRANSLATIONS.values())),
+    "job_functions": FieldRule(".description__job-criteria-list > li:nth-child(3) > span"),
+    "industries": FieldRule(".description__job-criteria-list > li:nth-child(4) > span"),
+    "description_container": FieldRule(".show-more-less-html__markup", attr='element', default=None),
+    "application_url": FieldRule("#teriary-cta-container > div > a", attr="href")
+})
+
+COMPANY_PAGE_PROFILE = ExtractionProfile("default", {
+    "company_details": FieldRule(("p.about-us__description", "section.core-section-container > div > p")),
+    "about_description": FieldRule("p.about-us__description"),
+    "company_website_url": FieldRule("dl > div:nth-child(1) > dd > a", attr="href"),
+    "company_industry": FieldRule("dl > div:nth-child(2) > dd"),
+    "company_size": FieldRule("dl > div:nth-child(3) > dd"),
+    "company_headquarters": FieldRule("dl > div:nth-child(4) > dd"),
+    "company_type": FieldRule("dl > div:nth-child(5) > dd"),
+    "company_founded": FieldRule("dl > div:nth-child(6) > dd"),
+    "company_specialties": FieldRule("dl > div:nth-child(7) > dd")
+})
+
+def override_profile(profile, name, fields):
+    """Derive a profile whose selectors (and optionally attributes) come from a JSON override mapping."""
+    rules = {}
+    for field, spec in fields.items():
+        rule = profile.rules.get(field) or FieldRule(spec["selector"])
+        rules[field] = rule.with_selectors(spec.get("selector", rule.selectors), spec.get("attr"))
+    return profile.derive(name, **rules)
+
+def build_extraction_profiles(base, kind, locale_rules=None):
+    """Return {name: profile} for a page kind: the base, per-locale variants and EXTRACTION_PROFILES_FILE overrides.
+
+    The overrides file is JSON shaped like {"job": {"default": {"job_title": {"selector": "h1.title"}}}}.
+    A "selector" may also be a list tried in order, and "attr" replaces the attribute to read.
+    locale_rules(base) returns {locale: {field: rule}}; it sees the overridden default profile.
+    """
+    overrides = {}
+    if EXTRACTION_PROFILES_FILE:
+        try:
+            with open(EXTRACTION_PROFILES_FILE, "r") as f:
+                overrides = json.load(f).get(kind, {})
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load extraction profiles from {EXTRACTION_PROFILES_FILE}: {str(e)}")
+    if "default" in overrides:
+        base = override_profile(base, "default", overrides["default"])
+    profiles = {"default": base}
+    for locale, rules in (locale_rules(base) if locale_rules else {}).items():
+        profiles[locale] = base.derive(locale, **rules)
+    for name, fields in overrides.items():
+        if name != "default":
+            profiles[name] = override_profile(profiles.get(name, base), name, fields)
+    if overrides:
+        logger.info(f"Loaded {kind} extraction overrides for profiles: {', '.join(overrides)}")
+    return profiles
+
+JOB_PAGE_PROFILES = build_extraction_profiles(JOB_PAGE_PROFILE, "job", lambda base: {
+    locale: {"job_type": base.rules["job_type"].with_post(job_type_translator(mapping))}
+    for locale, mapping in JOB_TYPE_TRANSLATIONS.items()
+})
+COMPANY_PAGE_PROFILES = build_extraction_profiles(COMPANY_PAGE_PROFILE, "company")
+
+def select_profile(profiles, url):
+    """Pick EXTRACTION_PROFILE if set, else the profile named after the LinkedIn locale subdomain, else the default."""
+    if EXTRACTION_PROFILE in profiles:
+        return profiles[EXTRACTION_PROFILE]
+    host = (urlparse(url or '').hostname or '').lower()
+    subdomain = host.split('.')[0] if host.endswith('linkedin.com') and host.count('.') >= 2 else ''
+    return profiles.get(subdomain) or profiles["default"]
+
+@dataclass
+class JobRecord:
+    """Everything scraped for one job; to_dict() gives the job_data/company_data the save functions read."""
+    job_title: str = ''
+    company_logo: str = ''
+    company_name: str = ''
+    company_url: str = ''
+    location: str = ''
+    environment: str = ''
+    job_type: str = ''
+    level: str = ''
+    job_functions: str = ''
+    industries: str = ''
+    job_description: str = ''
+    job_url: str = ''
+    company_details: str = ''
+    company_website_url: str = ''
+    company_industry: str = ''
+    company_size: str = ''
+    company_headquarters: str = ''
+    company_type: str = ''
+    company_founded: str = ''
+    company_specialties: str = ''
+    company_address: str = ''
+    application_url: str = ''
+    description_application_info: str = ''
+    description_application_url: str = ''
+    resolved_application_info: str = ''
+    final_application_email: str = ''
+    final_application_url: str = ''
+    job_salary: str = ''
+
+    def to_dict(self):
+        return asdict(self)
+
+EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+
+def deduplicate_paragraphs(paragraphs, job_title):
+    seen = set()
+    unique_paragraphs = []
+    for para in paragraphs:
+        para = sanitize_text(para)
+        if not para:
+            continue
+        norm_para = normalize_for_deduplication(para)
+        if norm_para and norm_para not in seen:
+            unique_paragraphs.append(para)
+            seen.add(norm_para)
+        elif norm_para:
+            logger.info(f"Removed duplicate paragraph in job description for {job_title}: {para[:50]}...")
+    return unique_paragraphs
+
+def build_job_description(description_container, job_title):
+    """Return the cleaned description plus any application email or link found in it."""
+    if description_container is None:
+        logger.warning(f"No job description container found for {job_title}")
+        return '', '', ''
+
+    paragraphs = description_container.find_all(['p', 'li'], recursive=False)
+    if paragraphs:
+        texts = [p.get_text().strip() for p in paragraphs]
+        logger.debug(f"Raw paragraphs for {job_title}: {[sanitize_text(text)[:50] for text in texts if text]}")
+    else:
+        raw_text = description_container.get_text(separator='\n').strip()
+        texts = [para.strip() for para in raw_text.split('\n\n') if para.strip()]
+        logger.debug(f"Raw text paragraphs for {job_title}: {[sanitize_text(text)[:50] for text in texts]}")
+    job_description = '\n\n'.join(deduplicate_paragraphs(texts, job_title))
+    logger.info(f'Raw Job Description (length): {len(job_description)}')
+    job_description = re.sub(r'(?i)(?:\s*Show\s+more\s*$|\s*Show\s+less\s*$)', '', job_description, flags=re.MULTILINE).strip()
+    job_description = split_paragraphs(job_description, max_length=200)
+    logger.info(f"Scraped Job Description (length): {len(job_description)}, Paragraphs: {len(job_description.splitlines())}")
+
+    description_application_info = ''
+    description_application_url = ''
+    emails = re.findall(EMAIL_PATTERN, job_description)
+    if emails:
+        description_application_info = emails[0]
+        logger.info(f'Found email in job description: {description_application_info}')
+    else:
+        for link in description_container.find_all('a', href=True):
+            href = link['href']
+            if 'apply' in href.lower() or 'careers' in href.lower() or 'jobs' in href.lower():
+                description_application_url = href
+                description_application_info = href
+                logger.info(f'Found application link in job description: {description_application_info}')
+                break
+    return job_description, description_application_info, description_application_url
+
+def extract_job_page(markup, job_url):
+    """Parse a LinkedIn job page into a JobRecord holding the fields available on the page itself."""
+    profile = select_profile(JOB_PAGE_PROFILES, job_url)
+    fields = profile.extract(parse_html(markup, 'job'))
+    description_container = fields.pop("description_container")
+    record = JobRecord(job_url=job_url, **fields)
+    (record.job_description, record.description_application_info,
+     record.description_application_url) = build_job_description(description_container, record.job_title)
+    return record
+
+def extract_company_page(markup, company_url=''):
+    """Parse a LinkedIn company page into {field: value} using the matching company profile."""
+    return select_profile(COMPANY_PAGE_PROFILES, company_url).extract(parse_html(markup, 'company'))
+
+PAGE_EXTRACTORS = {"job": extract_job_page, "company": extract_company_page}
+
+def warm_parse_worker():
+    """Process pool initializer: build the parser and compile every selector once, before real pages arrive."""
+    logger.disabled = True  # The empty warm-up pages would only log missing fields
+    try:
+        for extract in PAGE_EXTRACTORS.values():
+            extract('<html><body></body></html>', '')
+    finally:
+        logger.disabled = False
+
+def extract_page_content(kind, content, encoding, url):
+    """Parse-worker entry point: extract raw page bytes; return (record, parse seconds)."""
+    started = time.monotonic()
+    # Without a declared charset BeautifulSoup sniffs the bytes itself, as requests would for .text
+    markup = content.decode(encoding, errors='replace') if encoding else content
+    return PAGE_EXTRACTORS[kind](markup, url), time.monotonic() - started
+
+class ParsePool:
+    """Long-lived worker processes that turn raw job and company pages into records.
+
+    BeautifulSoup tree building and the description clean-up hold the GIL, so with many fetch
+    threads or coroutines they become the ceiling; PARSE_PROCESSES moves them onto other cores.
+    Workers receive the response bytes and return the extracted JobRecord or field dict, which
+    keeps what crosses the process boundary small. With PARSE_PROCESSES=0, or after a worker
+    crashes, pages are parsed in the calling thread as before.
+    """
+
+    def __init__(self, processes):
+        self.processes = processes
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.processes > 0
+
+    def start(self):
+        """Start and warm every worker so the first pages of the crawl do not wait for interpreter start-up."""
+        with self._lock:
+            if not self.enabled or self._executor is not None:
+                return self._executor
+            # forkserver/spawn children never inherit the crawl's threads, locks or SQLite handle
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context(method),
+                initializer=warm_parse_worker
+            )
+            logger.info(f"Started {self.processes} parse worker processes ({method})")
+        for future in [self._executor.submit(time.sleep, 0) for _ in range(self.processes)]:
+            future.result()
+        return self._executor
+
+    def _submit(self, kind, response, url):
+        return self.start().submit(extract_page_content, kind, response.content, response.encoding, url)
+
+    def _finish(self, kind, result):
+        record, seconds = result
+        metrics.observe('html_parse', seconds, page=kind)
+        return record
+
+    def _disable(self, error):
+        logger.error(f"Parse worker pool failed, parsing in-process from now on: {str(error)}")
+        self.processes = 0
+
+    def extract(self, kind, response, url):
+        """Extract a fetched job or company page, in a worker process when the pool is enabled."""
+        if self.enabled:
+            try:
+                return self._finish(kind, self._submit(kind, response, url).result())
+            except BrokenProcessPool as e:
+                self._disable(e)
+        return PAGE_EXTRACTORS[kind](response.text, url)
+
+    async def extract_async(self, kind, response, url, offload):
+        """extract() for coroutines; offload runs the in-process fallback off the event loop."""
+        if self.enabled:
+            try:
+                return self._finish(kind, await asyncio.wrap_future(self._submit(kind, response, url)))
+            except BrokenProcessPool as e:
+                self._disable(e)
+        return await offload(PAGE_EXTRACTORS[kind], response.text, url)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+parse_pool = ParsePool(PARSE_PROCESSES)
+
 def fetch_credentials():
     """Fetch WordPress credentials from the REST API if not provided in environment."""
     global WP_USERNAME, WP_APP_PASSWORD
@@ -67,7 +1412,7 @@ def fetch_credentials():
         logger.info("Using credentials from environment variables")
         return True
     try:
-        response = requests.get(WP_CREDENTIALS_URL, timeout=5, verify=False)
+        response = http_client.get(WP_CREDENTIALS_URL, timeout=5, verify=False)
         response.raise_for_status()
         data = response.json()
         if not data.get('success'):
@@ -87,7 +1432,7 @@ def fetch_credentials():
 def check_fetcher_status(auth_headers):
     """Check the fetcher status from WordPress."""
     try:
-        response = requests.get(WP_FETCHER_STATUS_URL, headers=auth_headers, timeout=5, verify=False)
+        response = http_client.get(WP_FETCHER_STATUS_URL, headers=auth_headers, timeout=5, verify=False, stage='status_check')
         response.raise_for_status()
         status = response.json().get('status', 'stopped')
         logger.info(f"Fetcher status check: {status}")
@@ -96,92 +1441,628 @@ def check_fetcher_status(auth_headers):
         logger.error(f"Failed to check fetcher status: {str(e)}")
         return 'stopped'
 
-def sanitize_text(text, is_url=False):
-    if not text:
-        return ''
-    if is_url:
-        text = text.strip()
-        if not text.startswith(('http://', 'https://')):
-            text = 'https://' + text
-        return text
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'(\w)\.(\w)', r'\1. \2', text)
-    text = re.sub(r'(\w)(\w)', r'\1 \2', text) if re.match(r'^\w+$', text) else text
-    return ' '.join(text.split())
+class FetcherStatusWatcher:
+    """Poll the fetcher status in the background and expose a cancellation signal."""
 
-def normalize_for_deduplication(text):
-    """Normalize text for deduplication by removing spaces, punctuation, and converting to lowercase."""
-    text = re.sub(r'[^\w\s]', '', text)
-    text = re.sub(r'\s+', '', text)
-    return text.lower()
+    def __init__(self, interval=STATUS_POLL_INTERVAL):
+        self.interval = interval
+        self.auth_headers = None
+        self.cancelled = threading.Event()
+        self._shutdown = threading.Event()
+        self._poll_lock = threading.Lock()
+        self._thread = None
+        self._last_poll = None
 
-def generate_job_id(job_title, company_name):
-    """Generate a unique job ID based on job title and company name."""
-    combined = f"{job_title}_{company_name}"
-    return hashlib.md5(combined.encode()).hexdigest()[:16]
+    def start(self, auth_headers):
+        """Do a first status check, then keep polling every interval seconds."""
+        self.auth_headers = auth_headers
+        self.poll()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="fetcher-status", daemon=True)
+            self._thread.start()
 
-def split_paragraphs(text, max_length=200):
-    """Split large paragraphs into smaller ones, each up to max_length characters."""
-    paragraphs = text.split('\n\n')
-    result = []
-    for para in paragraphs:
-        para = para.strip()
-        if not para:
-            continue
-        while len(para) > max_length:
-            split_point = para.rfind(' ', 0, max_length)
-            if split_point == -1:
-                split_point = para.rfind('.', 0, max_length)
-            if split_point == -1:
-                split_point = max_length
-            result.append(para[:split_point].strip())
-            para = para[split_point:].strip()
-        if para:
-            result.append(para)
-    return '\n\n'.join(result)
+    def stop(self):
+        self._shutdown.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
 
-def get_or_create_term(term_name, taxonomy, wp_url, auth_headers):
-    term_name = sanitize_text(term_name)
-    if not term_name:
-        return None
-    check_url = f"{wp_url}?search={term_name}"
-    try:
-        response = requests.get(check_url, headers=auth_headers, timeout=5, verify=False)
-        response.raise_for_status()
-        terms = response.json()
-        for term in terms:
-            if term['name'].lower() == term_name.lower():
-                return term['id']
-        post_data = {"name": term_name, "slug": term_name.lower().replace(' ', '-')}
-        response = requests.post(wp_url, json=post_data, headers=auth_headers, timeout=5, verify=False)
-        response.raise_for_status()
-        term = response.json()
-        logger.info(f"Created new {taxonomy} term: {term_name}, ID: {term['id']}")
-        return term['id']
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to get or create {taxonomy} term {term_name}: {str(e)}")
-        return None
+    def poll(self):
+        with self._poll_lock:
+            status = check_fetcher_status(self.auth_headers)
+            self._last_poll = time.monotonic()
+            if status != 'running' and not self.cancelled.is_set():
+                logger.info(f"Fetcher status is '{status}', cancelling in-flight work")
+                self.cancelled.set()
+            return status
 
-def check_existing_job(job_title, company_name, auth_headers):
-    """Check if a job with the same title and company already exists on WordPress."""
-    check_url = f"{WP_URL}?search={job_title}&meta_key=_company_name&meta_value={company_name}"
+    def _run(self):
+        while not self._shutdown.wait(self.interval) and not self.cancelled.is_set():
+            self.poll()
+
+    def is_running(self):
+        """Cheap in-memory status check; polls inline only when no watcher thread is running."""
+        if self.cancelled.is_set():
+            return False
+        if self._thread is None and (self._last_poll is None or time.monotonic() - self._last_poll >= self.interval):
+            self.poll()
+        return not self.cancelled.is_set()
+
+    def wait(self, seconds):
+        """Sleep for up to seconds; return False as soon as the fetcher is stopped."""
+        return not self.cancelled.wait(seconds)
+
+status_watcher = FetcherStatusWatcher()
+
+state_db_lock = threading.RLock()
+_state_db = None
+
+def get_state_db():
+    """Return the shared SQLite connection for persistent state; hold state_db_lock while using it."""
+    global _state_db
+    with state_db_lock:
+        if _state_db is None:
+            _state_db = sqlite3.connect(STATE_DB_FILE, check_same_thread=False)
+            _state_db.execute("PRAGMA journal_mode=WAL")
+            logger.info(f"Opened state database {STATE_DB_FILE}")
+        return _state_db
+
+def close_state_db():
+    global _state_db
+    with state_db_lock:
+        if _state_db is not None:
+            _state_db.commit()
+            _state_db.close()
+            _state_db = None
+
+def normalize_company_url(company_url):
+    """Normalize a LinkedIn company URL so locale subdomains, query strings and trailing slashes share a key."""
+    parsed = urlparse(company_url.strip())
+    host = parsed.netloc.lower()
+    if host == 'linkedin.com' or host.endswith('.linkedin.com'):
+        host = 'www.linkedin.com'
+    return f"{host}{parsed.path.rstrip('/')}".lower()
+
+class CompanyCache:
+    """LRU cache of parsed company profiles backed by the state database, with a TTL."""
+
+    def __init__(self, ttl=COMPANY_CACHE_TTL, max_entries=COMPANY_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._async_locks = {}
+        self._table_ready = False
+
+    def _db(self):
+        db = get_state_db()
+        if not self._table_ready:
+            db.execute("CREATE TABLE IF NOT EXISTS company_cache (url TEXT PRIMARY KEY, fetched_at REAL NOT NULL, profile TEXT NOT NULL)")
+            self._table_ready = True
+        return db
+
+    def _remember(self, key, fetched_at, profile):
+        with self._lock:
+            self._entries[key] = (fetched_at, profile)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, company_url):
+        """Return a copy of the cached profile, or None when missing or older than the TTL."""
+        key = normalize_company_url(company_url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            try:
+                with state_db_lock:
+                    row = self._db().execute("SELECT fetched_at, profile FROM company_cache WHERE url = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to read company cache for {key}: {str(e)}")
+                row = None
+            if row is None:
+                return None
+            entry = (row[0], json.loads(row[1]))
+            self._remember(key, *entry)
+        fetched_at, profile = entry
+        if time.time() - fetched_at > self.ttl:
+            return None
+        return dict(profile)
+
+    def put(self, company_url, profile):
+        key = normalize_company_url(company_url)
+        fetched_at = time.time()
+        profile = {field: profile.get(field, '') for field in COMPANY_PROFILE_FIELDS}
+        self._remember(key, fetched_at, profile)
+        try:
+            with state_db_lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO company_cache (url, fetched_at, profile) VALUES (?, ?, ?)", (key, fetched_at, json.dumps(profile)))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write company cache for {key}: {str(e)}")
+
+    def get_or_fetch(self, company_url, fetch):
+        """Return the cached profile or call fetch() once per company, even across concurrent workers."""
+        if page_archive.replaying:
+            # Re-parse the archived company page instead of the profile an earlier run cached
+            self.misses += 1
+            return fetch()
+        profile = self.get(company_url)
+        if profile is not None:
+            self.hits += 1
+            logger.info(f"Company cache hit for {company_url}")
+            return profile
+        key = normalize_company_url(company_url)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            profile = self.get(company_url)
+            if profile is not None:
+                self.hits += 1
+                return profile
+            self.misses += 1
+            profile = fetch()
+            self.put(company_url, profile)
+            return dict(profile)
+
+    async def get_or_fetch_async(self, company_url, fetch):
+        """get_or_fetch() for coroutines: fetch is awaited once per company across concurrent tasks."""
+        if page_archive.replaying:
+            self.misses += 1
+            return await fetch()
+        profile = await run_blocking(self.get, company_url)
+        if profile is not None:
+            self.hits += 1
+            logger.info(f"Company cache hit for {company_url}")
+            return profile
+        key = normalize_company_url(company_url)
+        key_lock = self._async_locks.setdefault(key, asyncio.Lock())
+        async with key_lock:
+            profile = await run_blocking(self.get, company_url)
+            if profile is not None:
+                self.hits += 1
+                return profile
+            self.misses += 1
+            profile = await fetch()
+            await run_blocking(self.put, company_url, profile)
+            return dict(profile)
+
+company_cache = CompanyCache()
+
+def media_source_key(logo_url):
+    """Drop the expiring signature query LinkedIn's CDN appends to logo URLs."""
+    parsed = urlparse(logo_url.strip())
+    return f"{parsed.netloc.lower()}{parsed.path}"
+
+class MediaCache:
+    """Maps logo source URLs and content digests to WordPress attachment IDs so each logo is uploaded once."""
+
+    digest_pattern = re.compile(r'_logo_([0-9a-f]{16})')
+
+    def __init__(self):
+        self.hits = 0
+        self.uploads = 0
+        self._by_source = None
+        self._by_digest = None
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._load_lock = threading.Lock()
+        self._loaded = threading.Event()
+
+    def _load(self):
+        with state_db_lock:
+            db = get_state_db()
+            db.execute("CREATE TABLE IF NOT EXISTS media_sources (source TEXT PRIMARY KEY, digest TEXT NOT NULL)")
+            db.execute("CREATE TABLE IF NOT EXISTS media_attachments (digest TEXT PRIMARY KEY, attachment_id INTEGER NOT NULL)")
+            db.execute("CREATE TABLE IF NOT EXISTS media_unhashed (attachment_id INTEGER PRIMARY KEY, source_url TEXT NOT NULL)")
+            self._by_source = dict(db.execute("SELECT source, digest FROM media_sources"))
+            self._by_digest = dict(db.execute("SELECT digest, attachment_id FROM media_attachments"))
+        logger.info(f"Loaded {len(self._by_digest)} cached media attachments")
+
+    def _ensure_loaded(self, auth_headers):
+        """Load the cache, seeding it first if needed; other workers wait for the listing, not for the hashing."""
+        if self._loaded.is_set():
+            return
+        with self._load_lock:
+            if self._loaded.is_set():
+                return
+            self._load()
+            if MEDIA_CACHE_SEED or not self._by_digest:
+                self.seed(auth_headers)
+            self._start_hashing()
+            self._loaded.set()
+
+    def seed(self, auth_headers):
+        """Record logos already in the media library by the digest in their file name.
+
+        Logos uploaded before file names carried a digest are queued in media_unhashed, and
+        _start_hashing() downloads and hashes up to MEDIA_SEED_HASH_MAX of them per run.
+        """
+        page = 1
+        found = 0
+        unhashed = []
+        known = set(self._by_digest.values())
+        while True:
+            try:
+                response = http_client.get(
+                    WP_MEDIA_URL,
+                    params={"search": "_logo", "per_page": 100, "page": page, "_fields": "id,source_url"},
+                    headers=auth_headers, timeout=15, verify=False
+                )
+                response.raise_for_status()
+                items = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.error(f"Failed to seed media cache from {WP_MEDIA_URL}: {str(e)}")
+                break
+            for item in items:
+                source_url = item.get('source_url') or ''
+                if not item.get('id') or not source_url or item['id'] in known:
+                    continue
+                match = self.digest_pattern.search(source_url)
+                if match:
+                    self._record(match.group(1), item['id'])
+                    found += 1
+                else:
+                    unhashed.append((item['id'], source_url))
+            total_pages = int(response.headers.get('X-WP-TotalPages', 1) or 1)
+            if not items or page >= total_pages:
+                break
+            page += 1
+        try:
+            with state_db_lock:
+                db = get_state_db()
+                db.executemany("INSERT OR IGNORE INTO media_unhashed (attachment_id, source_url) VALUES (?, ?)", unhashed)
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to queue media attachments for hashing: {str(e)}")
+        logger.info(f"Seeded media cache with {found} existing logo attachments, {len(unhashed)} older ones queued for hashing")
+
+    def _start_hashing(self):
+        try:
+            with state_db_lock:
+                rows = get_state_db().execute("SELECT attachment_id, source_url FROM media_unhashed LIMIT ?", (max(0, MEDIA_SEED_HASH_MAX),)).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read media attachments queued for hashing: {str(e)}")
+            return
+        if rows:
+            threading.Thread(target=self._hash_attachments, args=(rows,), name="media-seed", daemon=True).start()
+
+    def _hash_attachments(self, rows):
+        """Download queued attachments and record their digest, keeping any attachment already known for the same content."""
+        hashed = 0
+        for attachment_id, source_url in rows:
+            if not status_watcher.is_running():
+                break
+            try:
+                response = http_client.get(source_url, headers=headers, timeout=10, verify=False, stage='media_seed')
+                response.raise_for_status()
+                digest = hashlib.sha256(response.content).hexdigest()[:16]
+                with self._lock:
+                    known = digest in self._by_digest
+                if not known:
+                    self._record(digest, attachment_id)
+                    hashed += 1
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to download media attachment {attachment_id} for the media cache: {str(e)}")
+            try:
+                with state_db_lock:
+                    db = get_state_db()
+                    db.execute("DELETE FROM media_unhashed WHERE attachment_id = ?", (attachment_id,))
+                    db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to dequeue media attachment {attachment_id}: {str(e)}")
+        logger.info(f"Hashed {hashed} older logo attachments for the media cache")
+
+    def _record(self, digest, attachment_id, source=None):
+        with self._lock:
+            self._by_digest[digest] = attachment_id
+            if source:
+                self._by_source[source] = digest
+        try:
+            with state_db_lock:
+                db = get_state_db()
+                db.execute("INSERT OR REPLACE INTO media_attachments (digest, attachment_id) VALUES (?, ?)", (digest, attachment_id))
+                if source:
+                    db.execute("INSERT OR REPLACE INTO media_sources (source, digest) VALUES (?, ?)", (source, digest))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write media cache entry {digest}: {str(e)}")
+
+    def _cached(self, source):
+        with self._lock:
+            digest = self._by_source.get(source)
+            return self._by_digest.get(digest) if digest else None
+
+    def get_attachment_id(self, logo_url, company_name, auth_headers):
+        """Return the attachment ID for a logo, downloading and uploading it only when it is not cached."""
+        if not logo_url:
+            return 0
+        self._ensure_loaded(auth_headers)
+        source = media_source_key(logo_url)
+        attachment_id = self._cached(source)
+        if attachment_id:
+            self.hits += 1
+            return attachment_id
+        with self._lock:
+            key_lock = self._key_locks.setdefault(source, threading.Lock())
+        with key_lock:
+            attachment_id = self._cached(source)
+            if attachment_id:
+                self.hits += 1
+                return attachment_id
+            try:
+                logo_response = http_client.get(logo_url, headers=headers, timeout=10, stage='logo_download')
+                logo_response.raise_for_status()
+                digest = hashlib.sha256(logo_response.content).hexdigest()[:16]
+                with self._lock:
+                    attachment_id = self._by_digest.get(digest)
+                if attachment_id:
+                    self.hits += 1
+                    self._record(digest, attachment_id, source)
+                    logger.info(f"Reusing logo attachment {attachment_id} for {company_name} (same content)")
+                    return attachment_id
+                logo_headers = {
+                    "Authorization": auth_headers["Authorization"],
+                    "Content-Disposition": f'attachment; filename="{company_name}_logo_{digest}.jpg"',
+                    "Content-Type": logo_response.headers.get("content-type", "image/jpeg")
+                }
+                media_response = http_client.post(WP_MEDIA_URL, headers=logo_headers, data=logo_response.content, timeout=30, verify=False, stage='media_upload')
+                media_response.raise_for_status()
+                attachment_id = media_response.json().get("id", 0)
+                if attachment_id:
+                    self.uploads += 1
+                    self._record(digest, attachment_id, source)
+                logger.info(f"Uploaded logo for {company_name}, Attachment ID: {attachment_id}")
+                return attachment_id
+            except Exception as e:
+                logger.error(f"Failed to upload logo for {company_name}: {str(e)}")
+                return 0
+
+media_cache = MediaCache()
+
+def sanitize_text(text, is_url=False):
+    if not text:
+        return ''
+    if is_url:
+        text = text.strip()
+        if not text.startswith(('http://', 'https://')):
+            text = 'https://' + text
+        return text
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'(\w)\.(\w)', r'\1. \2', text)
+    text = re.sub(r'(\w)(\w)', r'\1 \2', text) if re.match(r'^\w+$', text) else text
+    return ' '.join(text.split())
+
+def normalize_for_deduplication(text):
+    """Normalize text for deduplication by removing spaces, punctuation, and converting to lowercase."""
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\s+', '', text)
+    return text.lower()
+
+def generate_job_id(job_title, company_name):
+    """Generate a unique job ID based on job title and company name."""
+    combined = f"{job_title}_{company_name}"
+    return hashlib.md5(combined.encode()).hexdigest()[:16]
+
+def split_paragraphs(text, max_length=200):
+    """Split large paragraphs into smaller ones, each up to max_length characters."""
+    paragraphs = text.split('\n\n')
+    result = []
+    for para in paragraphs:
+        para = para.strip()
+        if not para:
+            continue
+        while len(para) > max_length:
+            split_point = para.rfind(' ', 0, max_length)
+            if split_point == -1:
+                split_point = para.rfind('.', 0, max_length)
+            if split_point == -1:
+                split_point = max_length
+            result.append(para[:split_point].strip())
+            para = para[split_point:].strip()
+        if para:
+            result.append(para)
+    return '\n\n'.join(result)
+
+def term_slug(term_name):
+    """Return the WordPress slug for a term name, using JOB_TYPE_MAPPING for job types."""
+    if term_name in JOB_TYPE_MAPPING:
+        return JOB_TYPE_MAPPING[term_name]
+    ascii_name = unicodedata.normalize('NFKD', term_name).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '-', ascii_name.lower()).strip('-')
+
+class TermRegistry:
+    """In-memory name/slug to ID map of each taxonomy, loaded in full on first use; missing terms are created once."""
+
+    def __init__(self):
+        self._terms = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def _load(self, taxonomy, wp_url, auth_headers):
+        terms = {}
+        page = 1
+        while True:
+            response = http_client.get(wp_url, params={"per_page": 100, "page": page, "_fields": "id,name,slug"}, headers=auth_headers, timeout=15, verify=False, stage='term_load')
+            response.raise_for_status()
+            items = response.json()
+            for term in items:
+                terms[html.unescape(term.get('name', '')).lower()] = term['id']
+                terms[term.get('slug', '')] = term['id']
+            total_pages = int(response.headers.get('X-WP-TotalPages', 1) or 1)
+            if not items or page >= total_pages:
+                break
+            page += 1
+        terms.pop('', None)
+        logger.info(f"Loaded {len(terms)} {taxonomy} term names and slugs")
+        return terms
+
+    def _taxonomy(self, taxonomy, wp_url, auth_headers):
+        with self._lock:
+            terms = self._terms.get(taxonomy)
+            if terms is None:
+                terms = self._terms[taxonomy] = self._load(taxonomy, wp_url, auth_headers)
+            return terms
+
+    def _find(self, terms, term_name):
+        with self._lock:
+            return terms.get(term_name.lower()) or terms.get(term_slug(term_name))
+
+    def get_or_create(self, term_name, taxonomy, wp_url, auth_headers):
+        terms = self._taxonomy(taxonomy, wp_url, auth_headers)
+        term_id = self._find(terms, term_name)
+        if term_id:
+            return term_id
+        with self._lock:
+            key_lock = self._key_locks.setdefault((taxonomy, term_slug(term_name)), threading.Lock())
+        with key_lock:
+            term_id = self._find(terms, term_name)
+            if term_id:
+                return term_id
+            post_data = {"name": term_name, "slug": term_slug(term_name)}
+            response = http_client.post(wp_url, json=post_data, headers=auth_headers, timeout=5, verify=False, stage='term_create')
+            try:
+                term_id = response.json().get('id')
+                if not term_id and response.json().get('code') == 'term_exists':
+                    # Created elsewhere since the taxonomy was loaded
+                    term_id = response.json().get('data', {}).get('term_id')
+            except ValueError:
+                term_id = None
+            if not term_id:
+                response.raise_for_status()
+                raise requests.exceptions.RequestException(f"No term ID in response: {response.text[:200]}")
+            with self._lock:
+                terms[term_name.lower()] = term_id
+                terms[post_data["slug"]] = term_id
+            logger.info(f"Created new {taxonomy} term: {term_name}, ID: {term_id}")
+            return term_id
+
+term_registry = TermRegistry()
+
+def get_or_create_term(term_name, taxonomy, wp_url, auth_headers):
+    # Not sanitize_text(): it spaces out single words, which would turn "Contract" into a new term
+    term_name = ' '.join(re.sub(r'<[^>]+>', '', term_name or '').split())
+    if not term_name:
+        return None
     try:
-        response = requests.get(check_url, headers=auth_headers, timeout=5, verify=False)
-        response.raise_for_status()
-        posts = response.json()
-        if posts:
-            logger.info(f"Found existing job on WordPress: {job_title} at {company_name}, Post ID: {posts[0].get('id')}")
-            return posts[0].get('id'), posts[0].get('link')
-        return None, None
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to check existing job {job_title} at {company_name}: {str(e)}")
-        return None, None
+        return term_registry.get_or_create(term_name, taxonomy, wp_url, auth_headers)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"Failed to get or create {taxonomy} term {term_name}: {str(e)}")
+        return None
 
-def save_company_to_wordpress(index, company_data, wp_headers):
-    if check_fetcher_status(wp_headers) != 'running':
-        logger.info("Fetcher stopped before saving company")
-        return None, None
+class JobListingIndex:
+    """Local copy of the WordPress job listings (job ID, title, company, post ID, link) for existence checks.
+
+    The first sync pages through the whole wp/v2/job-listings collection; later syncs only ask for
+    posts modified after the newest one already indexed, so each run fetches the delta. A full
+    reload every JOB_INDEX_RESYNC drops listings deleted on WordPress.
+    """
+
+    # modified_after is exclusive and second-granular; overlap the previous sync so no edit is missed
+    OVERLAP_SECONDS = 60
+
+    def __init__(self, resync=JOB_INDEX_RESYNC):
+        self.resync = resync
+        self._by_key = None
+        self._synced = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(job_title, company_name):
+        return f"{(job_title or '').strip().lower()}|{(company_name or '').strip().lower()}"
+
+    def _db(self):
+        db = get_state_db()
+        db.execute("CREATE TABLE IF NOT EXISTS job_listings (post_id INTEGER PRIMARY KEY, job_id TEXT NOT NULL, job_key TEXT NOT NULL, "
+                   "title TEXT NOT NULL, company TEXT NOT NULL, link TEXT, modified TEXT)")
+        db.execute("CREATE INDEX IF NOT EXISTS job_listings_key ON job_listings (job_key)")
+        db.execute("CREATE TABLE IF NOT EXISTS job_listings_sync (id INTEGER PRIMARY KEY CHECK (id = 1), full_sync_at REAL NOT NULL)")
+        return db
+
+    def _load(self):
+        with state_db_lock:
+            db = self._db()
+            rows = db.execute("SELECT job_key, post_id, link FROM job_listings").fetchall()
+            watermark = db.execute("SELECT MAX(modified) FROM job_listings").fetchone()[0]
+            full_sync = db.execute("SELECT full_sync_at FROM job_listings_sync WHERE id = 1").fetchone()
+        self._by_key = {job_key: (post_id, link) for job_key, post_id, link in rows}
+        if full_sync is None or time.time() - full_sync[0] > self.resync:
+            return None
+        return watermark
+
+    def sync(self, auth_headers):
+        """Bring the index up to date with WordPress once per run."""
+        with self._lock:
+            if self._synced:
+                return
+            self._synced = True
+            watermark = self._load()
+            params = {"per_page": 100, "orderby": "modified", "order": "asc", "_fields": "id,link,title,meta,modified"}
+            if watermark:
+                try:
+                    params["modified_after"] = (datetime.fromisoformat(watermark) - timedelta(seconds=self.OVERLAP_SECONDS)).isoformat()
+                except ValueError:
+                    watermark = None
+            fetched = {}
+            page = 1
+            while True:
+                try:
+                    response = http_client.get(WP_URL, params=dict(params, page=page), headers=auth_headers, timeout=15, verify=False, stage='job_index_sync')
+                    response.raise_for_status()
+                    posts = response.json()
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    logger.error(f"Failed to sync job listing index from {WP_URL}: {str(e)}")
+                    return
+                for post in posts:
+                    if post.get('id'):
+                        fetched[post['id']] = post
+                total_pages = int(response.headers.get('X-WP-TotalPages', 1) or 1)
+                if not posts or page >= total_pages:
+                    break
+                page += 1
+            self._store(fetched.values(), full=not watermark)
+            logger.info(f"Job listing index: {len(fetched)} listings {'updated' if watermark else 'loaded'}, {len(self._by_key)} indexed")
+
+    def _store(self, posts, full):
+        rows = []
+        for post in posts:
+            title = html.unescape((post.get('title') or {}).get('rendered', '')) if isinstance(post.get('title'), dict) else str(post.get('title') or '')
+            company = html.unescape(str((post.get('meta') or {}).get('_company_name') or ''))
+            rows.append((post['id'], generate_job_id(title, company), self.key(title, company), title, company, post.get('link'), post.get('modified')))
+        try:
+            with state_db_lock:
+                db = self._db()
+                if full:
+                    db.execute("DELETE FROM job_listings")
+                    db.execute("INSERT OR REPLACE INTO job_listings_sync (id, full_sync_at) VALUES (1, ?)", (time.time(),))
+                db.executemany("INSERT OR REPLACE INTO job_listings (post_id, job_id, job_key, title, company, link, modified) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                db.commit()
+                self._by_key = {job_key: (post_id, link) for job_key, post_id, link in db.execute("SELECT job_key, post_id, link FROM job_listings")}
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write job listing index: {str(e)}")
 
+    def find(self, job_title, company_name):
+        """Return (post_id, link) of an indexed listing with this title and company, or (None, None)."""
+        return self._by_key.get(self.key(job_title, company_name), (None, None)) if self._by_key else (None, None)
+
+job_listings = JobListingIndex()
+
+def check_existing_job(job_title, company_name, auth_headers):
+    """Check if a job with the same title and company already exists on WordPress."""
+    job_listings.sync(auth_headers)
+    post_id, link = job_listings.find(job_title, company_name)
+    if post_id:
+        logger.info(f"Found existing job on WordPress: {job_title} at {company_name}, Post ID: {post_id}")
+    return post_id, link
+
+def build_company_payload(company_data, wp_headers):
+    """Return (company_id, payload) for the save-company route, uploading the logo if it is not cached."""
     company_name = company_data.get("company_name", "")
     company_details = company_data.get("company_details", "")
     company_logo = company_data.get("company_logo", "")
@@ -193,22 +2074,7 @@ def save_company_to_wordpress(index, company_data, wp_headers):
     
     company_id = hashlib.md5(company_name.encode()).hexdigest()[:16]
     
-    attachment_id = 0
-    if company_logo:
-        try:
-            logo_response = requests.get(company_logo, headers=headers, timeout=10)
-            logo_response.raise_for_status()
-            logo_headers = {
-                "Authorization": wp_headers["Authorization"],
-                "Content-Disposition": f'attachment; filename="{company_name}_logo.jpg"',
-                "Content-Type": logo_response.headers.get("content-type", "image/jpeg")
-            }
-            media_response = requests.post(WP_MEDIA_URL, headers=logo_headers, data=logo_response.content, verify=False)
-            media_response.raise_for_status()
-            attachment_id = media_response.json().get("id", 0)
-            logger.info(f"Uploaded logo for {company_name}, Attachment ID: {attachment_id}")
-        except Exception as e:
-            logger.error(f"Failed to upload logo for {company_name}: {str(e)}")
+    attachment_id = media_cache.get_attachment_id(company_logo, company_name, wp_headers)
 
     post_data = {
         "company_id": company_id,
@@ -224,9 +2090,21 @@ def save_company_to_wordpress(index, company_data, wp_headers):
         "company_twitter": "",
         "company_video": ""
     }
+    return company_id, post_data
+
+def save_company_to_wordpress(index, company_data, wp_headers):
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped before saving company")
+        return None, None
+
+    company_id, post_data = build_company_payload(company_data, wp_headers)
+    return submit_company(company_data.get("company_name", ""), company_id, post_data, wp_headers)
+
+def submit_company(company_name, company_id, post_data, wp_headers):
+    """POST one company payload to the save-company route."""
     response = None
     try:
-        response = requests.post(WP_SAVE_COMPANY_URL, json=post_data, headers=wp_headers, timeout=15, verify=False)
+        response = http_client.post(WP_SAVE_COMPANY_URL, json=post_data, headers=wp_headers, timeout=15, verify=False, stage='company_save')
         response.raise_for_status()
         res = response.json()
         if res.get("success"):
@@ -242,11 +2120,8 @@ def save_company_to_wordpress(index, company_data, wp_headers):
         logger.error(f"Failed to save company {company_name}: {str(e)}, Status: {response.status_code if response else 'None'}, Response: {response.text if response else 'None'}")
         return None, None
 
-def save_article_to_wordpress(index, job_data, company_id, auth_headers):
-    if check_fetcher_status(auth_headers) != 'running':
-        logger.info("Fetcher stopped before saving job")
-        return None, None
-
+def build_job_payload(job_data, company_id, auth_headers):
+    """Return (job_id, payload) for the save-job route, uploading the logo if it is not cached."""
     job_title = job_data.get("job_title", "")
     job_description = job_data.get("job_description", "")
     job_type = job_data.get("job_type", "")
@@ -271,22 +2146,7 @@ def save_article_to_wordpress(index, job_data, company_id, auth_headers):
         if not application:
             logger.warning(f"No valid application email or URL found for job {job_title}")
 
-    attachment_id = 0
-    if company_logo:
-        try:
-            logo_response = requests.get(company_logo, headers=headers, timeout=10)
-            logo_response.raise_for_status()
-            logo_headers = {
-                "Authorization": auth_headers["Authorization"],
-                "Content-Disposition": f'attachment; filename="{company_name}_logo_job_{index}.jpg"',
-                "Content-Type": logo_response.headers.get("content-type", "image/jpeg")
-            }
-            media_response = requests.post(WP_MEDIA_URL, headers=logo_headers, data=logo_response.content, verify=False)
-            media_response.raise_for_status()
-            attachment_id = media_response.json().get("id", 0)
-            logger.info(f"Uploaded logo for job {job_title}, Attachment ID: {attachment_id}")
-        except Exception as e:
-            logger.error(f"Failed to upload logo for job {job_title}: {str(e)}")
+    attachment_id = media_cache.get_attachment_id(company_logo, company_name, auth_headers)
 
     post_data = {
         "job_id": job_id,
@@ -310,9 +2170,21 @@ def save_article_to_wordpress(index, job_data, company_id, auth_headers):
     }
     
     logger.info(f"Final job post payload for {job_title}: {json.dumps(post_data, indent=2)[:200]}...")
-    
+    return job_id, post_data
+
+def save_article_to_wordpress(index, job_data, company_id, auth_headers):
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped before saving job")
+        return None, None
+
+    job_id, post_data = build_job_payload(job_data, company_id, auth_headers)
+    return submit_job(job_data.get("job_title", ""), job_id, post_data, auth_headers)
+
+def submit_job(job_title, job_id, post_data, auth_headers):
+    """POST one job payload to the save-job route; return (job_id, link), link None when the job already existed and nothing was written."""
+    response = None
     try:
-        response = requests.post(WP_SAVE_JOB_URL, json=post_data, headers=auth_headers, timeout=15, verify=False)
+        response = http_client.post(WP_SAVE_JOB_URL, json=post_data, headers=auth_headers, timeout=15, verify=False, stage='job_save')
         response.raise_for_status()
         res = response.json()
         if res.get("success"):
@@ -320,7 +2192,7 @@ def save_article_to_wordpress(index, job_data, company_id, auth_headers):
             return job_id, f"{WP_SITE_URL}/wp-content/uploads/jobs.json"
         elif res.get("message") == "Job exists":
             logger.info(f"Found existing job {job_title}: Job ID {job_id}")
-            return job_id, f"{WP_SITE_URL}/wp-content/uploads/jobs.json"
+            return job_id, None
         else:
             logger.error(f"Failed to save job {job_title}: {res}")
             return None, None
@@ -328,536 +2200,1967 @@ def save_article_to_wordpress(index, job_data, company_id, auth_headers):
         logger.error(f"Failed to save job {job_title}: {str(e)}, Status: {response.status_code if response else 'None'}, Response: {response.text if response else 'None'}")
         return None, None
 
-def load_processed_ids():
-    """Load processed job IDs from file."""
-    processed_ids = set()
-    try:
-        if os.path.exists(PROCESSED_IDS_FILE):
-            with open(PROCESSED_IDS_FILE, "r") as f:
-                processed_ids = set(line.strip() for line in f if line.strip())
-            logger.info(f"Loaded {len(processed_ids)} processed job IDs from {PROCESSED_IDS_FILE}")
-    except Exception as e:
-        logger.error(f"Failed to load processed IDs from {PROCESSED_IDS_FILE}: {str(e)}")
-    return processed_ids
+update_job_supported = True
 
-def save_processed_id(job_id):
-    """Append a single job ID to the processed IDs file."""
-    try:
-        with open(PROCESSED_IDS_FILE, "a") as f:
-            f.write(f"{job_id}\n")
-        logger.info(f"Saved job ID {job_id} to {PROCESSED_IDS_FILE}")
-    except Exception as e:
-        logger.error(f"Failed to save job ID {job_id} to {PROCESSED_IDS_FILE}: {str(e)}")
+def update_job(job_title, job_id, fields, auth_headers):
+    """POST the changed fields of a saved job to the update-job route.
 
-def load_last_page():
-    """Load the last processed page number."""
+    update-job takes {"job_id", <changed save-job fields>} and answers {"job_id", "success", "message"},
+    with message "Job not found" when WordPress no longer has the job. Returns 'updated', 'missing'
+    for a vanished job, 'unsupported' once the route turned out not to exist (404), or None.
+    Without the route changes cannot reach WordPress, so JOB_REFRESH_DAYS re-scrapes are turned off.
+    """
+    global update_job_supported
+    if not update_job_supported:
+        return 'unsupported'
+    response = None
     try:
-        if os.path.exists(LAST_PAGE_FILE):
-            with open(LAST_PAGE_FILE, "r") as f:
-                page = int(f.read().strip())
-                logger.info(f"Loaded last processed page: {page}")
-                return page
-    except Exception as e:
-        logger.error(f"Failed to load last page from {LAST_PAGE_FILE}: {str(e)}")
-    return 0
+        response = http_client.post(WP_UPDATE_JOB_URL, json=dict(fields, job_id=job_id), headers=auth_headers, timeout=15, verify=False, stage='job_update')
+        if response.status_code == 404:
+            logger.warning(f"Update route {WP_UPDATE_JOB_URL} not available, changed jobs cannot be updated; no longer re-scraping saved jobs")
+            update_job_supported = False
+            job_fingerprints.refresh = 0
+            return 'unsupported'
+        response.raise_for_status()
+        res = response.json()
+        if res.get("success"):
+            logger.info(f"Updated job {job_title}: Job ID {job_id}, fields {', '.join(fields)}")
+            return 'updated'
+        elif res.get("message") == "Job not found":
+            return 'missing'
+        else:
+            logger.error(f"Failed to update job {job_title}: {res}")
+            return None
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error(f"Failed to update job {job_title}: {str(e)}, Status: {response.status_code if response else 'None'}, Response: {response.text if response else 'None'}")
+        return None
 
-def save_last_page(page):
-    """Save the last processed page number."""
-    try:
-        with open(LAST_PAGE_FILE, "w") as f:
-            f.write(str(page))
-        logger.info(f"Saved last processed page: {page} to {LAST_PAGE_FILE}")
-    except Exception as e:
-        logger.error(f"Failed to save last page to {LAST_PAGE_FILE}: {str(e)}")
+class BatchWriter:
+    """Buffer company and job payloads and save them through the bulk route, flushing by count or age.
 
-def crawl(auth_headers, processed_ids):
-    # Check initial fetcher status
-    if check_fetcher_status(auth_headers) != 'running':
-        logger.info("Fetcher stopped by initial status check")
-        print("Fetcher is not running. Exiting.")
-        return
+    POST save-batch takes {"companies": [...], "jobs": [...]} with the usual save-company/save-job
+    payloads, saves companies first, and answers {"companies": [{"company_id", "success", "message"}],
+    "jobs": [{"job_id", "success", "message"}]}. A job counts as saved when both it and its company
+    report success or "exists". If the route is missing (404) or a bulk call fails, the batch is
+    saved item by item through save-company and save-job instead.
+    """
 
-    success_count = 0
-    failure_count = 0
-    total_jobs = 0
-    start_page = load_last_page()
-    
-    for i in range(start_page, 15):
-        # Check status before processing each page
-        if check_fetcher_status(auth_headers) != 'running':
-            logger.info("Fetcher stopped during page processing")
-            print("Fetcher stopped by user. Exiting.")
-            break
+    def __init__(self, auth_headers, max_items=WP_BATCH_SIZE, max_delay=WP_BATCH_MAX_DELAY):
+        self.auth_headers = auth_headers
+        self.max_items = max(1, max_items)
+        self.max_delay = max_delay
+        self.bulk_supported = None
+        self._pending = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="wp-batch-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, job_id, job_title, company_id, company_name, company_payload, job_payload, on_result):
+        """Queue one job; on_result(saved, message) is called once its batch has been flushed, with saved None if the fetcher stopped first."""
+        with self._lock:
+            self._pending.append({
+                "job_id": job_id,
+                "job_title": job_title,
+                "company_id": company_id,
+                "company_name": company_name,
+                "company_payload": company_payload,
+                "job_payload": job_payload,
+                "on_result": on_result
+            })
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._pending) >= self.max_items
+        if full:
+            self.flush()
+
+    def _run(self):
+        while not self._closed.wait(min(1.0, self.max_delay)):
+            with self._lock:
+                due = self._oldest is not None and time.monotonic() - self._oldest >= self.max_delay
+            if due:
+                self.flush()
 
-        url = f'https://www.linkedin.com/jobs/search?keywords={KEYWORD}&location={COUNTRY}&start={i * 25}'
-        logger.info(f'Fetching job search page: {url}')
-        time.sleep(random.uniform(5, 10))
+    def close(self):
+        self._closed.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                items, self._pending, self._oldest = self._pending, [], None
+            if not items:
+                return
+            if not status_watcher.is_running():
+                logger.info(f"Fetcher stopped, not saving {len(items)} buffered jobs")
+                results = [(None, "fetcher stopped")] * len(items)
+            else:
+                results = self._save_bulk(items) if self.bulk_supported is not False else None
+                if results is None:
+                    results = [self._save_single(item) for item in items]
+            for item, (saved, message) in zip(items, results):
+                try:
+                    item["on_result"](saved, message)
+                except Exception as e:
+                    logger.error(f"Failed to record save result for job {item['job_id']}: {str(e)}")
+
+    def _save_bulk(self, items):
+        companies = {}
+        for item in items:
+            companies.setdefault(item["company_id"], item["company_payload"])
+        payload = {"companies": list(companies.values()), "jobs": [item["job_payload"] for item in items]}
+        response = None
         try:
-            session = requests.Session()
-            retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-            session.mount('https://', HTTPAdapter(max_retries=retries))
-            response = session.get(url, headers=headers, timeout=15)
+            response = http_client.post(WP_SAVE_BATCH_URL, json=payload, headers=self.auth_headers, timeout=60, verify=False, stage='batch_save')
+            if response.status_code == 404:
+                logger.warning(f"Bulk save route {WP_SAVE_BATCH_URL} not available, saving jobs one by one")
+                self.bulk_supported = False
+                return None
             response.raise_for_status()
-            if "login" in response.url or "challenge" in response.url:
-                logger.error("Login or CAPTCHA detected, stopping crawl")
-                print("Login or CAPTCHA detected, stopping crawl")
-                break
-            soup = BeautifulSoup(response.text, 'html.parser')
-            job_list = soup.select("#main-content > section > ul > li > div > a")
-            urls = [a['href'] for a in job_list if a.get('href')]
-            logger.info(f'Found {len(urls)} job URLs on page: {url}')
-            
-            for index, job_url in enumerate(urls):
-                # Check status before processing each job
-                if check_fetcher_status(auth_headers) != 'running':
-                    logger.info("Fetcher stopped during job processing")
-                    print("Fetcher stopped by user. Exiting.")
-                    break
-
-                job_data = scrape_job_details(job_url, auth_headers)
-                if not job_data:
-                    logger.error(f"No data scraped for job: {job_url}")
-                    print(f"Job (URL: {job_url}) failed to scrape: No data returned")
-                    failure_count += 1
-                    total_jobs += 1
-                    continue
-                
-                job_dict = {
-                    "job_title": job_data[0],
-                    "company_logo": job_data[1],
-                    "company_name": job_data[2],
-                    "company_url": job_data[3],
-                    "location": job_data[4],
-                    "environment": job_data[5],
-                    "job_type": job_data[6],
-                    "level": job_data[7],
-                    "job_functions": job_data[8],
-                    "industries": job_data[9],
-                    "job_description": job_data[10],
-                    "job_url": job_data[11],
-                    "company_details": job_data[12],
-                    "company_website_url": job_data[13],
-                    "company_industry": job_data[14],
-                    "company_size": job_data[15],
-                    "company_headquarters": job_data[16],
-                    "company_type": job_data[17],
-                    "company_founded": job_data[18],
-                    "company_specialties": job_data[19],
-                    "company_address": job_data[20],
-                    "application_url": job_data[21],
-                    "description_application_info": job_data[22],
-                    "resolved_application_info": job_data[23],
-                    "final_application_email": job_data[24],
-                    "final_application_url": job_data[25],
-                    "job_salary": ""
-                }
-                
-                job_title = job_dict.get("job_title", "Unknown Job")
-                company_name = job_dict.get("company_name", "")
-                
-                job_id = generate_job_id(job_title, company_name)
-                
-                if job_id in processed_ids:
-                    logger.info(f"Skipping already processed job: {job_id} ({job_title} at {company_name})")
-                    print(f"Job '{job_title}' at {company_name} (ID: {job_id}) skipped - already processed.")
-                    total_jobs += 1
-                    continue
-                
-                if not company_name or company_name.lower() == "unknown":
-                    logger.info(f"Skipping job with unknown company: {job_title} (ID: {job_id})")
-                    print(f"Job '{job_title}' (ID: {job_id}) skipped - unknown company")
-                    failure_count += 1
-                    total_jobs += 1
-                    continue
-                
-                total_jobs += 1
-                
-                company_id, company_url = save_company_to_wordpress(index, job_dict, auth_headers)
-                if company_id is None:
-                    failure_count += 1
-                    continue
+            res = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Failed to save batch of {len(items)} jobs: {str(e)}, Status: {response.status_code if response is not None else 'None'}, falling back to single saves")
+            return None
+        self.bulk_supported = True
+        logger.info(f"Saved batch of {len(companies)} companies and {len(items)} jobs")
 
-                job_post_id, job_post_url = save_article_to_wordpress(index, job_dict, company_id, auth_headers)
-                if job_post_id is None:
-                    failure_count += 1
-                    continue
-                
-                processed_ids.add(job_id)
-                save_processed_id(job_id)
-                logger.info(f"Processed and saved job: {job_id} - {job_title} at {company_name}")
-                print(f"Job '{job_title}' at {company_name} (ID: {job_id}) successfully posted to WordPress. Post ID: {job_post_id}, URL {job_post_url}")
-                success_count += 1
-            
-            save_last_page(i)
-        
-        except Exception as e:
-            logger.error(f'Error fetching job search page: {url} - {str(e)}')
-            print(f"Error fetching page {url}: {str(e)}")
-            failure_count += 1
-    
-    print("\n--- Summary ---")
-    print(f"Total jobs processed: {total_jobs}")
-    print(f"Successfully posted: {success_count}")
-    print(f"Failed to post or scrape: {failure_count}")
+        company_results = {r.get("company_id"): r for r in res.get("companies", [])}
+        job_results = {r.get("job_id"): r for r in res.get("jobs", [])}
+        results = []
+        for item in items:
+            company = company_results.get(item["company_id"], {})
+            job = job_results.get(item["job_id"], {})
+            company_saved = company.get("success") or company.get("message") == "Company exists"
+            job_saved = job.get("success") or job.get("message") == "Job exists"
+            if company_saved and job_saved:
+                results.append((True, job.get("message") or "saved"))
+            else:
+                message = job.get("message") or company.get("message") or "missing from batch response"
+                logger.error(f"Failed to save job {item['job_title']} in batch: {message}")
+                results.append((False, message))
+        return results
 
-def scrape_job_details(job_url, auth_headers):
-    if check_fetcher_status(auth_headers) != 'running':
-        logger.info("Fetcher stopped before fetching job details")
-        return None
+    def _save_single(self, item):
+        company_id, _ = submit_company(item["company_name"], item["company_id"], item["company_payload"], self.auth_headers)
+        if company_id is None:
+            return False, "company not saved"
+        job_id, link = submit_job(item["job_title"], item["job_id"], item["job_payload"], self.auth_headers)
+        if job_id is None:
+            return False, "job not saved"
+        return True, "saved" if link else "Job exists"
 
-    logger.info(f'Fetching job details from: {job_url}')
+def job_id_digest(job_id):
+    """Map a job ID (16 hex digits of MD5) to a signed 64-bit integer key."""
     try:
-        session = requests.Session()
-        retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-        session.mount('https://', HTTPAdapter(max_retries=retries))
-        response = session.get(job_url, headers=headers, timeout=15)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        value = int(job_id[:16], 16) if len(job_id) == 16 else None
+    except ValueError:
+        value = None
+    if value is None:
+        value = int(hashlib.md5(job_id.encode()).hexdigest()[:16], 16)
+    return value - (1 << 64) if value >= (1 << 63) else value
 
-        job_title = soup.select_one("h1.top-card-layout__title")
-        job_title = job_title.get_text().strip() if job_title else ''
-        logger.info(f'Scraped Job Title: {job_title}')
+class ProcessedIdStore:
+    """Processed job IDs kept as 64-bit keys in the state database, with batched commits."""
 
-        company_logo = soup.select_one("#main-content > section.core-rail.mx-auto.papabear\:w-core-rail-width.mamabear\:max-w-\[790px\].babybear\:max-w-\[790px\] > div > section.top-card-layout.container-lined.overflow-hidden.babybear\:rounded-\[0px\] > div > a > img")
-        company_logo = (company_logo.get('data-delayed-url') or company_logo.get('src') or '') if company_logo else ''
-        logger.info(f'Scraped Company Logo URL: {company_logo}')
+    def __init__(self, batch_size=PROCESSED_IDS_BATCH):
+        self.batch_size = max(1, batch_size)
+        self._pending = set()
+        self._table_ready = False
 
-        company_name = soup.select_one(".topcard__org-name-link")
-        company_name = company_name.get_text().strip() if company_name else ''
-        logger.info(f'Scraped Company Name: {company_name}')
+    def _db(self):
+        db = get_state_db()
+        if not self._table_ready:
+            db.execute("CREATE TABLE IF NOT EXISTS processed_jobs (id INTEGER PRIMARY KEY)")
+            self._table_ready = True
+        return db
 
-        company_url = soup.select_one(".topcard__org-name-link")
-        company_url = company_url['href'] if company_url and company_url.get('href') else ''
-        if company_url:
-            company_url = re.sub(r'\?.*$', '', company_url)
-            logger.info(f'Scraped Company URL: {company_url}')
-        else:
-            logger.info('No Company URL found')
+    def __contains__(self, job_id):
+        key = job_id_digest(job_id)
+        with state_db_lock:
+            if key in self._pending:
+                return True
+            try:
+                return self._db().execute("SELECT 1 FROM processed_jobs WHERE id = ?", (key,)).fetchone() is not None
+            except sqlite3.Error as e:
+                logger.error(f"Failed to look up processed job ID {job_id}: {str(e)}")
+                return False
 
-        if check_fetcher_status(auth_headers) != 'running':
-            logger.info("Fetcher stopped before fetching company details")
-            return None
+    def __len__(self):
+        with state_db_lock:
+            self.flush()
+            return self._db().execute("SELECT COUNT(*) FROM processed_jobs").fetchone()[0]
 
-        location = soup.select_one(".topcard__flavor.topcard__flavor--bullet")
-        location = location.get_text().strip() if location else COUNTRY
-        location_parts = [part.strip() for part in location.split(',') if part.strip()]
-        location = ', '.join(dict.fromkeys(location_parts))
-        logger.info(f'Deduplicated location for {job_title}: {location}')
-
-        environment = ''
-        env_element = soup.select(".topcard__flavor--metadata")
-        for elem in env_element:
-            text = elem.get_text().strip().lower()
-            if 'remote' in text or 'hybrid' in text or 'on-site' in text:
-                environment = elem.get_text().strip()
-                break
-        logger.info(f'Scraped Environment: {environment}')
-
-        level = soup.select_one(".description__job-criteria-list > li:nth-child(1) > span")
-        level = level.get_text().strip() if level else ''
-        logger.info(f'Scraped Level: {level}')
-
-        job_type = soup.select_one(".description__job-criteria-list > li:nth-child(2) > span")
-        job_type = job_type.get_text().strip() if job_type else ''
-        job_type = FRENCH_TO_ENGLISH_JOB_TYPE.get(job_type, job_type)
-        logger.info(f'Scraped Type: {job_type}')
-
-        job_functions = soup.select_one(".description__job-criteria-list > li:nth-child(3) > span")
-        job_functions = job_functions.get_text().strip() if job_functions else ''
-        logger.info(f'Scraped Job Functions: {job_functions}')
-
-        industries = soup.select_one(".description__job-criteria-list > li:nth-child(4) > span")
-        industries = industries.get_text().strip() if industries else ''
-        logger.info(f'Scraped Industries: {industries}')
-
-        job_description = ''
-        description_container = soup.select_one(".show-more-less-html__markup")
-        if description_container:
-            paragraphs = description_container.find_all(['p', 'li'], recursive=False)
-            if paragraphs:
-                seen = set()
-                unique_paragraphs = []
-                logger.debug(f"Raw paragraphs for {job_title}: {[sanitize_text(p.get_text().strip())[:50] for p in paragraphs if p.get_text().strip()]}")
-                for p in paragraphs:
-                    para = sanitize_text(p.get_text().strip())
-                    if not para:
-                        continue
-                    norm_para = normalize_for_deduplication(para)
-                    if norm_para and norm_para not in seen:
-                        unique_paragraphs.append(para)
-                        seen.add(norm_para)
-                    elif norm_para:
-                        logger.info(f"Removed duplicate paragraph in job description for {job_title}: {para[:50]}...")
-                job_description = '\n\n'.join(unique_paragraphs)
-            else:
-                raw_text = description_container.get_text(separator='\n').strip()
-                paragraphs = [para.strip() for para in raw_text.split('\n\n') if para.strip()]
-                seen = set()
-                unique_paragraphs = []
-                logger.debug(f"Raw text paragraphs for {job_title}: {[sanitize_text(para)[:50] for para in paragraphs]}")
-                for para in paragraphs:
-                    para = sanitize_text(para)
-                    if not para:
+    def add(self, job_id):
+        with state_db_lock:
+            self._pending.add(job_id_digest(job_id))
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Write buffered IDs in one transaction."""
+        with state_db_lock:
+            if not self._pending:
+                return
+            try:
+                db = self._db()
+                db.executemany("INSERT OR IGNORE INTO processed_jobs (id) VALUES (?)", [(key,) for key in self._pending])
+                db.commit()
+                logger.info(f"Saved {len(self._pending)} processed job IDs to {STATE_DB_FILE}")
+                self._pending.clear()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to save processed job IDs to {STATE_DB_FILE}: {str(e)}")
+
+    def migrate_csv(self, path=PROCESSED_IDS_FILE, chunk_size=10000):
+        """Import a legacy processed-IDs CSV once, then rename it so it is not read again."""
+        if not os.path.exists(path):
+            return 0
+        imported = 0
+        try:
+            with open(path, "r") as f, state_db_lock:
+                db = self._db()
+                chunk = []
+                for line in f:
+                    job_id = line.strip()
+                    if not job_id:
                         continue
-                    norm_para = normalize_for_deduplication(para)
-                    if norm_para and norm_para not in seen:
-                        unique_paragraphs.append(para)
-                        seen.add(norm_para)
-                    elif norm_para:
-                        logger.info(f"Removed duplicate paragraph in job description for {job_title}: {para[:50]}...")
-                job_description = '\n\n'.join(unique_paragraphs)
-            logger.info(f'Raw Job Description (length): {len(job_description)}')
-            job_description = re.sub(r'(?i)(?:\s*Show\s+more\s*$|\s*Show\s+less\s*$)', '', job_description, flags=re.MULTILINE).strip()
-            job_description = split_paragraphs(job_description, max_length=200)
-            logger.info(f"Scraped Job Description (length): {len(job_description)}, Paragraphs: {len(job_description.splitlines())}")
-        else:
-            logger.warning(f"No job description container found for {job_title}")
-
-        description_application_info = ''
-        description_application_url = ''
-        if description_container:
-            email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-            emails = re.findall(email_pattern, job_description)
-            if emails:
-                description_application_info = emails[0]
-                logger.info(f'Found email in job description: {description_application_info}')
-            else:
-                links = description_container.find_all('a', href=True)
-                for link in links:
-                    href = link['href']
-                    if 'apply' in href.lower() or 'careers' in href.lower() or 'jobs' in href.lower():
-                        description_application_url = href
-                        description_application_info = href
-                        logger.info(f'Found application link in job description: {description_application_info}')
-                        break
+                    chunk.append((job_id_digest(job_id),))
+                    if len(chunk) >= chunk_size:
+                        db.executemany("INSERT OR IGNORE INTO processed_jobs (id) VALUES (?)", chunk)
+                        imported += len(chunk)
+                        chunk = []
+                if chunk:
+                    db.executemany("INSERT OR IGNORE INTO processed_jobs (id) VALUES (?)", chunk)
+                    imported += len(chunk)
+                db.commit()
+            os.replace(path, f"{path}.migrated")
+            logger.info(f"Migrated {imported} processed job IDs from {path} to {STATE_DB_FILE}")
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Failed to migrate processed IDs from {path}: {str(e)}")
+        return imported
 
-        application_anchor = soup.select_one("#teriary-cta-container > div > a")
-        application_url = application_anchor['href'] if application_anchor and application_anchor.get('href') else None
-        logger.info(f'Scraped Application URL: {application_url}')
+def load_processed_ids():
+    """Open the processed job ID store, migrating the legacy CSV on first use."""
+    store = ProcessedIdStore()
+    store.migrate_csv()
+    # No COUNT(*) here: it scans the whole table on every start
+    logger.info(f"Opened processed job ID store in {STATE_DB_FILE}")
+    return store
 
-        resolved_application_info = ''
-        resolved_application_url = ''
-        final_application_email = description_application_info if description_application_info and '@' in description_application_info else ''
-        final_application_url = description_application_url if description_application_url else ''
+@dataclass(frozen=True)
+class SearchQuery:
+    """One country/keyword combination crawled through the LinkedIn job search."""
+    country: str
+    keyword: str = ''
 
-        if application_url:
-            if check_fetcher_status(auth_headers) != 'running':
-                logger.info("Fetcher stopped before following application URL")
-                return None
+    @property
+    def key(self):
+        return f"{self.country}|{self.keyword}"
 
-            try:
-                time.sleep(5)
-                resp_app = session.get(application_url, headers=headers, timeout=15, allow_redirects=True, verify=False)
-                resolved_application_url = resp_app.url
-                logger.info(f'Resolved Application URL: {resolved_application_url}')
-                
-                app_soup = BeautifulSoup(resp_app.text, 'html.parser')
-                email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-                emails = re.findall(email_pattern, resp_app.text)
-                if emails:
-                    resolved_application_info = emails[0]
-                    logger.info(f'Found email in application page: {resolved_application_info}')
-                else:
-                    links = app_soup.find_all('a', href=True)
-                    for link in links:
-                        href = link['href']
-                        if 'apply' in href.lower() or 'careers' in href.lower() or 'jobs' in href.lower():
-                            resolved_application_info = href
-                            logger.info(f'Found application link in application page: {resolved_application_info}')
-                            break
-
-                if final_application_email and resolved_application_info and '@' in resolved_application_info:
-                    final_application_email = final_application_email if final_application_email == resolved_application_info else final_application_email
-                elif resolved_application_info and '@' in resolved_application_info:
-                    final_application_email = final_application_email or resolved_application_info
-
-                if description_application_url and resolved_application_url:
-                    final_application_url = description_application_url if description_application_url == resolved_application_url else resolved_application_url
-                elif resolved_application_url:
-                    final_application_url = resolved_application_url
+    def page_url(self, page):
+        return f'{LINKEDIN_BASE_URL}/jobs/search?keywords={self.keyword}&location={self.country}&start={page * 25}'
 
-            except Exception as e:
-                logger.error(f'Failed to follow application URL redirect: {str(e)}')
-                error_str = str(e)
-                external_url_match = re.search(r'host=\'([^\']+)\'', error_str)
-                if external_url_match:
-                    external_url = external_url_match.group(1)
-                    final_application_url = f"https://{external_url}"
-                    logger.info(f'Extracted external URL from error for application: {final_application_url}')
-                else:
-                    final_application_url = description_application_url if description_application_url else application_url or ''
-                    logger.warning(f'No external URL found in error, using fallback: {final_application_url}')
-
-        company_details = ''
-        company_website_url = ''
-        company_industry = ''
-        company_size = ''
-        company_headquarters = ''
-        company_type = ''
-        company_founded = ''
-        company_specialties = ''
-        company_address = ''
-
-        if company_url:
-            if check_fetcher_status(auth_headers) != 'running':
-                logger.info("Fetcher stopped before fetching company page")
-                return None
+def load_search_queries():
+    """Return the queries to crawl: SEARCH_QUERIES when set, otherwise COUNTRY and KEYWORD."""
+    queries = []
+    for entry in SEARCH_QUERIES.replace('\n', ';').split(';'):
+        country, _, keyword = entry.partition('|')
+        query = SearchQuery(country.strip(), keyword.strip())
+        if query.country and query not in queries:
+            queries.append(query)
+    return queries or [SearchQuery(COUNTRY or '', KEYWORD)]
 
-            logger.info(f'Fetching company page: {company_url}')
-            try:
-                company_response = session.get(company_url, headers=headers, timeout=15)
-                company_response.raise_for_status()
-                company_soup = BeautifulSoup(company_response.text, 'html.parser')
-
-                company_details_elem = company_soup.select_one("p.about-us__description") or company_soup.select_one("section.core-section-container > div > p")
-                company_details = company_details_elem.get_text().strip() if company_details_elem else ''
-                logger.info(f'Scraped Company Details: {company_details[:100] + "..." if company_details else ""}')
-
-                company_website_anchor = company_soup.select_one("dl > div:nth-child(1) > dd > a")
-                company_website_url = company_website_anchor['href'] if company_website_anchor and company_website_anchor.get('href') else ''
-                logger.info(f'Scraped Company Website URL: {company_website_url}')
-
-                if 'linkedin.com/redir/redirect' in company_website_url:
-                    parsed_url = urlparse(company_website_url)
-                    query_params = parse_qs(parsed_url.query)
-                    if 'url' in query_params:
-                        company_website_url = unquote(query_params['url'][0])
-                        logger.info(f'Extracted external company website from redirect: {company_website_url}')
-                    else:
-                        logger.warning(f'No "url" param in LinkedIn redirect for {company_name}')
-
-                if company_website_url and 'linkedin.com' not in company_website_url:
-                    if check_fetcher_status(auth_headers) != 'running':
-                        logger.info("Fetcher stopped before resolving company website")
-                        return None
-
-                    try:
-                        time.sleep(5)
-                        resp_company_web = session.get(company_website_url, headers=headers, timeout=15, allow_redirects=True, verify=False)
-                        company_website_url = resp_company_web.url
-                        logger.info(f'Resolved Company Website URL: {company_website_url}')
-                    except Exception as e:
-                        logger.error(f'Failed to resolve company website URL: {str(e)}')
-                        error_str = str(e)
-                        external_url_match = re.search(r'host=\'([^\']+)\'', error_str)
-                        if external_url_match:
-                            external_url = external_url_match.group(1)
-                            company_website_url = f"https://{external_url}"
-                            logger.info(f'Extracted external URL from error for company website: {company_website_url}')
-                        else:
-                            logger.warning(f'No external URL found in error for {company_name}')
-                            company_website_url = ''
-                else:
-                    description_elem = company_soup.select_one("p.about-us__description")
-                    if description_elem:
-                        description_text = description_elem.get_text()
-                        url_pattern = r'https?://(?!www\.linkedin\.com)[^\s]+'
-                        urls = re.findall(url_pattern, description_text)
-                        if urls:
-                            company_website_url = urls[0]
-                            logger.info(f'Found company website in description: {company_website_url}')
-                            if check_fetcher_status(auth_headers) != 'running':
-                                logger.info("Fetcher stopped before resolving company website from description")
-                                return None
-                            try:
-                                time.sleep(5)
-                                resp_company_web = session.get(company_website_url, headers=headers, timeout=15, allow_redirects=True, verify=False)
-                                company_website_url = resp_company_web.url
-                                logger.info(f'Resolved Company Website URL: {company_website_url}')
-                            except Exception as e:
-                                logger.error(f'Failed to resolve company website from description: {str(e)}')
-                                company_website_url = ''
-
-                company_industry_elem = company_soup.select_one("dl > div:nth-child(2) > dd")
-                company_industry = company_industry_elem.get_text().strip() if company_industry_elem else ''
-                logger.info(f'Scraped Company Industry: {company_industry}')
-
-                company_size_elem = company_soup.select_one("dl > div:nth-child(3) > dd")
-                company_size = company_size_elem.get_text().strip() if company_size_elem else ''
-                logger.info(f'Scraped Company Size: {company_size}')
-
-                company_headquarters_elem = company_soup.select_one("dl > div:nth-child(4) > dd")
-                company_headquarters = company_headquarters_elem.get_text().strip() if company_headquarters_elem else ''
-                logger.info(f'Scraped Company Headquarters: {company_headquarters}')
-
-                company_type_elem = company_soup.select_one("dl > div:nth-child(5) > dd")
-                company_type = company_type_elem.get_text().strip() if company_type_elem else ''
-                logger.info(f'Scraped Company Type: {company_type}')
-
-                company_founded_elem = company_soup.select_one("dl > div:nth-child(6) > dd")
-                company_founded = company_founded_elem.get_text().strip() if company_founded_elem else ''
-                logger.info(f'Scraped Company Founded: {company_founded}')
-
-                company_specialties_elem = company_soup.select_one("dl > div:nth-child(7) > dd")
-                company_specialties = company_specialties_elem.get_text().strip() if company_specialties_elem else ''
-                logger.info(f'Scraped Company Specialties: {company_specialties}')
-
-                company_address = company_headquarters if company_headquarters else location
-                logger.info(f'Set Company Address: {company_address}')
+class SearchCheckpoints:
+    """Per-query resume points: the last search page whose jobs have all finished, kept in the state database."""
 
-            except Exception as e:
-                logger.error(f'Failed to scrape company page {company_url}: {str(e)}')
-                company_website_url = ''
-                company_industry = ''
-                company_size = ''
-                company_headquarters = ''
-                company_type = ''
-                company_founded = ''
-                company_specialties = ''
-                company_address = location
-                logger.info(f'Using fallback company address: {company_address}')
-
-        return (
-            job_title,
-            company_logo,
-            company_name,
-            company_url,
-            location,
-            environment,
-            job_type,
-            level,
-            job_functions,
-            industries,
-            job_description,
-            job_url,
-            company_details,
-            company_website_url,
-            company_industry,
-            company_size,
-            company_headquarters,
-            company_type,
-            company_founded,
-            company_specialties,
-            company_address,
-            application_url,
-            description_application_info,
-            resolved_application_info,
-            final_application_email,
-            final_application_url
-        )
+    def __init__(self):
+        self._table_ready = False
 
-    except Exception as e:
-        logger.error(f'Failed to scrape job details from {job_url}: {str(e)}')
-        return None
+    def _db(self):
+        db = get_state_db()
+        if not self._table_ready:
+            db.execute("CREATE TABLE IF NOT EXISTS search_checkpoints (query TEXT PRIMARY KEY, page INTEGER NOT NULL)")
+            self._table_ready = True
+        return db
 
-def main():
-    # Fetch credentials if not provided
-    if not fetch_credentials():
-        logger.error("Cannot proceed without valid WordPress credentials")
-        print("Error: Cannot proceed without valid WordPress credentials")
-        return
+    def load(self, query):
+        """Return the page to resume the query from, 0 when it has no checkpoint."""
+        try:
+            with state_db_lock:
+                row = self._db().execute("SELECT page FROM search_checkpoints WHERE query = ?", (query.key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to load search checkpoint for {query.key}: {str(e)}")
+            return 0
+        if row:
+            logger.info(f"Loaded last processed page for {query.key}: {row[0]}")
+            return row[0]
+        return 0
 
-    # Create authentication headers
-    auth_string = f"{WP_USERNAME}:{WP_APP_PASSWORD}"
-    auth_headers = {
-        "Authorization": f"Basic {base64.b64encode(auth_string.encode()).decode()}"
-    }
+    def save(self, query, page):
+        try:
+            with state_db_lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO search_checkpoints (query, page) VALUES (?, ?)", (query.key, page))
+                db.commit()
+            logger.info(f"Saved last processed page for {query.key}: {page}")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save search checkpoint for {query.key}: {str(e)}")
 
-    # Load processed job IDs
-    processed_ids = load_processed_ids()
+    def clear(self, query):
+        """Forget a finished query's checkpoint so the next run starts from its first page."""
+        try:
+            with state_db_lock:
+                db = self._db()
+                db.execute("DELETE FROM search_checkpoints WHERE query = ?", (query.key,))
+                db.commit()
+            logger.info(f"Finished all search pages for {query.key}, cleared its checkpoint")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to clear search checkpoint for {query.key}: {str(e)}")
+
+    def migrate_last_page(self, query, path=LAST_PAGE_FILE):
+        """Import the legacy last-page file as the checkpoint of the given query, then rename it."""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r") as f:
+                page = int(f.read().strip())
+            self.save(query, page)
+            os.replace(path, f"{path}.migrated")
+            logger.info(f"Migrated last processed page {page} from {path} to {STATE_DB_FILE}")
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to migrate last page from {path}: {str(e)}")
+
+search_checkpoints = SearchCheckpoints()
+
+class SearchPagination:
+    """Chooses the next search page of each query and decides when a query is exhausted.
+
+    Queries take turns one page at a time, each from its checkpoint. A query ends after
+    SEARCH_STALE_PAGES consecutive pages without new jobs (empty, failed or fully processed
+    pages all count), and it only goes past SEARCH_PAGES, up to SEARCH_MAX_PAGES, while its
+    latest page still produced new jobs. on_exhausted(query) is called when a query ends
+    on its own, not when the crawl is stopped.
+    """
+
+    def __init__(self, queries, on_exhausted=None):
+        self.on_exhausted = on_exhausted
+        self.next_page = {query: search_checkpoints.load(query) for query in queries}
+        self.stale_pages = dict.fromkeys(queries, 0)
+        self.active = list(queries)
+
+    def stop_reason(self, query, page):
+        stale_pages = self.stale_pages[query]
+        if stale_pages >= max(1, SEARCH_STALE_PAGES):
+            return f"{stale_pages} pages in a row without new jobs"
+        if page >= max(SEARCH_PAGES, SEARCH_MAX_PAGES):
+            return f"reached the {max(SEARCH_PAGES, SEARCH_MAX_PAGES)} page cap"
+        if page >= SEARCH_PAGES and stale_pages:
+            return "last page had no new jobs"
+        return None
 
-    # Start crawling
-    crawl(auth_headers, processed_ids)
+    def __iter__(self):
+        """Yield (query, page) round-robin until every query is exhausted."""
+        while self.active:
+            for query in list(self.active):
+                page = self.next_page[query]
+                reason = self.stop_reason(query, page)
+                if reason:
+                    logger.info(f"Stopping search for {query.key} before page {page}: {reason}")
+                    metrics.gauge('search_pages_crawled', page, query=query.key)
+                    self.active.remove(query)
+                    if self.on_exhausted is not None:
+                        self.on_exhausted(query)
+                    continue
+                self.next_page[query] = page + 1
+                yield query, page
+
+    def report(self, query, new_jobs):
+        """Record how many jobs a page handed to the pipeline that were not already known."""
+        self.stale_pages[query] = 0 if new_jobs else self.stale_pages[query] + 1
+
+def extract_linkedin_job_id(value):
+    """Return the numeric LinkedIn posting ID from a jobPosting URN or a job view URL."""
+    if not value:
+        return ''
+    match = re.search(r'jobPosting:(\d+)', value) or re.search(r'(\d+)/?$', urlparse(value).path)
+    return match.group(1) if match else ''
+
+def parse_search_results(soup):
+    """Return the job URL, LinkedIn posting ID, title and company shown on each search result card."""
+    cards = []
+    for anchor in soup.select("#main-content > section > ul > li > div > a"):
+        href = anchor.get('href')
+        if not href:
+            continue
+        card = anchor.parent
+        title = card.select_one(".base-search-card__title")
+        company = card.select_one(".base-search-card__subtitle")
+        cards.append({
+            "job_url": href,
+            "linkedin_id": extract_linkedin_job_id(card.get('data-entity-urn', '')) or extract_linkedin_job_id(href),
+            "job_title": title.get_text().strip() if title else '',
+            "company_name": company.get_text().strip() if company else ''
+        })
+    return cards
+
+class SeenJobIndex:
+    """Persistent LinkedIn posting ID to job ID index, consulted before any detail request."""
+
+    def __init__(self):
+        self._table_ready = False
+
+    def _db(self):
+        db = get_state_db()
+        if not self._table_ready:
+            db.execute("CREATE TABLE IF NOT EXISTS seen_jobs (linkedin_id TEXT PRIMARY KEY, job_id TEXT NOT NULL, seen_at REAL NOT NULL)")
+            self._table_ready = True
+        return db
+
+    def lookup(self, linkedin_id):
+        if not linkedin_id:
+            return None
+        try:
+            with state_db_lock:
+                row = self._db().execute("SELECT job_id FROM seen_jobs WHERE linkedin_id = ?", (linkedin_id,)).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read seen job {linkedin_id}: {str(e)}")
+            return None
+
+    def record(self, linkedin_id, job_id):
+        if not linkedin_id:
+            return
+        try:
+            with state_db_lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO seen_jobs (linkedin_id, job_id, seen_at) VALUES (?, ?, ?)", (linkedin_id, job_id, time.time()))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record seen job {linkedin_id}: {str(e)}")
+
+    def known_job_id(self, card, processed_ids):
+        """Return the job ID when a search card belongs to an already processed job, otherwise None."""
+        job_id = self.lookup(card["linkedin_id"])
+        if job_id and job_id in processed_ids:
+            return job_id
+        if card["job_title"] and card["company_name"]:
+            job_id = generate_job_id(card["job_title"], card["company_name"])
+            if job_id in processed_ids:
+                self.record(card["linkedin_id"], job_id)
+                return job_id
+        return None
+
+seen_jobs = SeenJobIndex()
+
+processed_ids_lock = threading.Lock()
+jobs_in_progress = set()
+
+class CrawlStats:
+    """Thread-safe job outcome counters for the run summary."""
+
+    def __init__(self):
+        self.total = 0
+        self.success = 0
+        self.failure = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.update_unsupported = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcome):
+        if outcome is None:
+            return
+        metrics.incr('jobs', outcome=outcome)
+        with self._lock:
+            self.total += 1
+            if outcome == 'success':
+                self.success += 1
+            elif outcome == 'failure':
+                self.failure += 1
+            elif outcome == 'updated':
+                self.updated += 1
+            elif outcome == 'unchanged':
+                self.unchanged += 1
+            elif outcome == 'update_unsupported':
+                self.update_unsupported += 1
+
+    def record_page_error(self):
+        metrics.incr('search_page_errors')
+        with self._lock:
+            self.failure += 1
+
+class JobFingerprints:
+    """Per-field digests of each saved job payload, keyed like processed_jobs, so a re-scrape sends only what changed."""
+
+    # Attachment IDs depend on the media cache, not on the listing
+    IGNORED_FIELDS = ('job_id', 'featured_media', 'company_logo')
+
+    def __init__(self, refresh=JOB_REFRESH):
+        self.refresh = refresh
+        self._table_ready = False
+
+    def _db(self):
+        db = get_state_db()
+        if not self._table_ready:
+            db.execute("CREATE TABLE IF NOT EXISTS job_fingerprints (id INTEGER PRIMARY KEY, fingerprint TEXT NOT NULL, fields TEXT NOT NULL, checked_at REAL NOT NULL)")
+            self._table_ready = True
+        return db
+
+    def digests(self, payload):
+        fields = {}
+        for field, value in payload.items():
+            if field not in self.IGNORED_FIELDS:
+                normalized = ' '.join(str(value if value is not None else '').split())
+                fields[field] = hashlib.sha1(normalized.encode()).hexdigest()[:16]
+        return fields
+
+    def _row(self, job_id):
+        try:
+            with state_db_lock:
+                return self._db().execute("SELECT fingerprint, fields, checked_at FROM job_fingerprints WHERE id = ?", (job_id_digest(job_id),)).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read fingerprint of job {job_id}: {str(e)}")
+            return None
+
+    def due(self, job_id):
+        """True when a processed job should be scraped again to look for changes."""
+        if self.refresh <= 0:
+            return False
+        row = self._row(job_id)
+        return row is None or time.time() - row[2] > self.refresh
+
+    def changed(self, job_id, payload):
+        """Return the payload fields that differ from the last saved version, or None when no fingerprint is stored."""
+        row = self._row(job_id)
+        if row is None:
+            return None
+        fields = self.digests(payload)
+        if hashlib.sha1(json.dumps(fields, sort_keys=True).encode()).hexdigest() == row[0]:
+            return []
+        previous = json.loads(row[1])
+        return [field for field, digest in fields.items() if previous.get(field) != digest]
+
+    def store(self, job_id, payload):
+        fields = self.digests(payload)
+        fingerprint = hashlib.sha1(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+        try:
+            with state_db_lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO job_fingerprints (id, fingerprint, fields, checked_at) VALUES (?, ?, ?, ?)",
+                           (job_id_digest(job_id), fingerprint, json.dumps(fields), time.time()))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to store fingerprint of job {job_id}: {str(e)}")
+
+    def touch(self, job_id):
+        try:
+            with state_db_lock:
+                db = self._db()
+                db.execute("UPDATE job_fingerprints SET checked_at = ? WHERE id = ?", (time.time(), job_id_digest(job_id)))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to update fingerprint of job {job_id}: {str(e)}")
+
+job_fingerprints = JobFingerprints()
+
+def mark_job_saved(job_id, processed_ids, linkedin_id, job_payload=None):
+    with processed_ids_lock:
+        processed_ids.add(job_id)
+    seen_jobs.record(linkedin_id, job_id)
+    if job_payload:
+        job_fingerprints.store(job_id, job_payload)
+
+@dataclass
+class JobItem:
+    """One search result moving through the pipeline stages."""
+    page: int
+    index: int
+    job_url: str
+    query: SearchQuery = None
+    linkedin_id: str = ''
+    job_id: str = ''
+    record: JobRecord = None
+    job_data: dict = None
+    company_id: str = ''
+    company_payload: dict = None
+    job_payload: dict = None
+    company_saved: bool = False
+    refresh: bool = False
+    enqueued_at: float = 0.0
+
+class JobJournal:
+    """Append-only log of each job's progress, kept in the state database so a restarted run resumes mid-page.
+
+    Stages are discovered, scraped (with the enriched record), company_saved, and finally
+    job_saved or finished for any other outcome. Entries are buffered and committed
+    JOURNAL_BATCH at a time in one transaction. replay() compacts the log at startup and
+    returns the jobs that never reached a final stage: scraped ones go straight to the media
+    and persistence stages, discovered ones are scraped without waiting for their search page.
+    """
+
+    def __init__(self, batch_size=JOURNAL_BATCH):
+        self.batch_size = max(1, batch_size)
+        self._pending = []
+        self._resumed = set()
+        self._table_ready = False
+
+    def _db(self):
+        db = get_state_db()
+        if not self._table_ready:
+            db.execute("CREATE TABLE IF NOT EXISTS job_journal (seq INTEGER PRIMARY KEY AUTOINCREMENT, job_key TEXT NOT NULL, "
+                       "stage TEXT NOT NULL, data TEXT NOT NULL, logged_at REAL NOT NULL)")
+            self._table_ready = True
+        return db
+
+    @staticmethod
+    def job_key(linkedin_id, job_url):
+        return linkedin_id or job_url
+
+    def append(self, item, stage, **data):
+        entry = (self.job_key(item.linkedin_id, item.job_url), stage, json.dumps(data), time.time())
+        with state_db_lock:
+            self._pending.append(entry)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Commit buffered entries in one transaction."""
+        with state_db_lock:
+            if not self._pending:
+                return
+            try:
+                db = self._db()
+                db.executemany("INSERT INTO job_journal (job_key, stage, data, logged_at) VALUES (?, ?, ?, ?)", self._pending)
+                db.commit()
+                self._pending.clear()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write job journal to {STATE_DB_FILE}: {str(e)}")
+
+    def discovered(self, item):
+        query = [item.query.country, item.query.keyword] if item.query is not None else None
+        self.append(item, 'discovered', job_url=item.job_url, linkedin_id=item.linkedin_id, query=query, page=item.page, refresh=item.refresh)
+
+    def scraped(self, item):
+        self.append(item, 'scraped', job_url=item.job_url, linkedin_id=item.linkedin_id, job_id=item.job_id, record=item.record.to_dict())
+
+    def company_saved(self, item):
+        self.append(item, 'company_saved', company_id=item.company_id)
+
+    def finished(self, item, outcome):
+        self.append(item, 'job_saved' if outcome == 'success' else 'finished', outcome=outcome)
+
+    def is_resumed(self, card):
+        return self.job_key(card["linkedin_id"], card["job_url"]) in self._resumed
+
+    def replay(self, processed_ids):
+        """Compact the journal to unfinished jobs and return them as JobItems, scraped ones with their record."""
+        jobs = OrderedDict()
+        try:
+            with state_db_lock:
+                self.flush()
+                db = self._db()
+                for job_key, stage, data in db.execute("SELECT job_key, stage, data FROM job_journal ORDER BY seq"):
+                    job = jobs.setdefault(job_key, {})
+                    job.update(json.loads(data))
+                    job["stage"] = stage
+                unfinished = [
+                    (job_key, job) for job_key, job in jobs.items()
+                    if job["stage"] not in ('job_saved', 'finished') and job.get("job_url")
+                    and not (job.get("job_id") and job["job_id"] in processed_ids)
+                ]
+                db.execute("DELETE FROM job_journal")
+                db.executemany("INSERT INTO job_journal (job_key, stage, data, logged_at) VALUES (?, ?, ?, ?)",
+                               [(job_key, job["stage"], json.dumps(job), time.time()) for job_key, job in unfinished])
+                db.commit()
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Failed to replay job journal from {STATE_DB_FILE}: {str(e)}")
+            return []
+
+        # Saves whose processed-ID batch was lost in a crash are still known from the journal
+        for job in jobs.values():
+            if job["stage"] == 'job_saved' and job.get("job_id") and job["job_id"] not in processed_ids:
+                with processed_ids_lock:
+                    processed_ids.add(job["job_id"])
+                seen_jobs.record(job.get("linkedin_id"), job["job_id"])
+
+        items = []
+        for job_key, job in unfinished:
+            item = JobItem(page=None, index=0, job_url=job["job_url"], linkedin_id=job.get("linkedin_id") or '',
+                           query=SearchQuery(*job["query"]) if job.get("query") else None, refresh=job.get("refresh", False))
+            if job.get("record"):
+                item.job_id = job["job_id"]
+                item.record = JobRecord(**{k: v for k, v in job["record"].items() if k in JobRecord.__dataclass_fields__})
+                item.company_saved = job["stage"] == 'company_saved'
+            self._resumed.add(job_key)
+            items.append(item)
+        if items:
+            scraped = sum(1 for item in items if item.record is not None)
+            logger.info(f"Resuming {len(items)} jobs from the journal ({scraped} already scraped)")
+            print(f"Resuming {len(items)} unfinished jobs from the previous run ({scraped} already scraped).")
+        return items
+
+job_journal = JobJournal()
+
+_STAGE_DONE = object()
+
+def screen_search_card(card, processed_ids, auth_headers, stats):
+    """Decide from a search card alone whether its job needs scraping; return (scrape, refresh)."""
+    known_job_id = seen_jobs.known_job_id(card, processed_ids)
+    refresh = bool(known_job_id) and job_fingerprints.due(known_job_id)
+    if known_job_id and not refresh:
+        logger.info(f"Skipping already processed job before scraping: {known_job_id} ({card['job_title']} at {card['company_name']})")
+        print(f"Job '{card['job_title']}' at {card['company_name']} (ID: {known_job_id}) skipped - already processed.")
+        stats.record('skipped')
+        return False, False
+    if refresh:
+        logger.info(f"Re-scraping processed job {known_job_id} to look for changes ({card['job_title']} at {card['company_name']})")
+    else:
+        post_id, _ = check_existing_job(card['job_title'], card['company_name'], auth_headers)
+        if post_id:
+            print(f"Job '{card['job_title']}' at {card['company_name']} (Post ID: {post_id}) skipped - already on WordPress.")
+            stats.record('skipped')
+            return False, False
+    return True, refresh
+
+def admit_job(item, record, processed_ids):
+    """Claim a scraped job for this run; return 'admitted', or the outcome to finish it with ('skipped', 'failure' or None when stopped)."""
+    if record is None:
+        if not status_watcher.is_running():
+            return None
+        logger.error(f"No data scraped for job: {item.job_url}")
+        print(f"Job (URL: {item.job_url}) failed to scrape: No data returned")
+        return 'failure'
+
+    job_title = record.job_title
+    company_name = record.company_name
+    job_id = generate_job_id(job_title, company_name)
+
+    with processed_ids_lock:
+        already_seen = (job_id in processed_ids and not item.refresh) or job_id in jobs_in_progress
+        if not already_seen:
+            jobs_in_progress.add(job_id)
+    if already_seen:
+        seen_jobs.record(item.linkedin_id, job_id)
+        logger.info(f"Skipping already processed job: {job_id} ({job_title} at {company_name})")
+        print(f"Job '{job_title}' at {company_name} (ID: {job_id}) skipped - already processed.")
+        return 'skipped'
+    item.job_id = job_id
+    item.record = record
+    if not record.location and item.query is not None:
+        record.location = item.query.country
+
+    if not company_name or company_name.lower() == "unknown":
+        logger.info(f"Skipping job with unknown company: {job_title} (ID: {job_id})")
+        print(f"Job '{job_title}' (ID: {job_id}) skipped - unknown company")
+        return 'failure'
+    return 'admitted'
+
+class PipelineStage:
+    """Worker threads reading a bounded inbox; the handler returns the item for the next stage, or None once it is finished."""
+
+    def __init__(self, name, handler, workers, on_drop, maxsize=PIPELINE_QUEUE_SIZE):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.on_drop = on_drop
+        self.inbox = queue.Queue(maxsize=max(1, maxsize))
+        self.downstream = None
+        self._threads = []
+
+    def start(self):
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def put(self, item):
+        """Hand an item to this stage, blocking while its inbox is full."""
+        item.enqueued_at = time.monotonic()
+        self.inbox.put(item)
+
+    def _work(self):
+        while True:
+            item = self.inbox.get()
+            if item is _STAGE_DONE:
+                return
+            metrics.observe('pipeline_queue_wait', time.monotonic() - item.enqueued_at, stage=self.name)
+            if not status_watcher.is_running():
+                self.on_drop(item)
+                continue
+            try:
+                with metrics.timer('pipeline_stage', stage=self.name):
+                    result = self.handler(item)
+            except Exception as e:
+                logger.error(f"Stage {self.name} failed for job {item.job_url}: {str(e)}")
+                self.on_drop(item, 'failure')
+                continue
+            if result is not None:
+                self.downstream.put(result)
+
+    def close(self):
+        """Let the workers finish every queued item, then stop them."""
+        for _ in self._threads:
+            self.inbox.put(_STAGE_DONE)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+class JobPipeline:
+    """Detail scrape -> enrichment -> media -> WordPress persistence, connected by bounded queues.
+
+    Each stage has its own worker count, so a slow stage fills its inbox and blocks the stage
+    before it (down to search discovery) instead of buffering without limit. Once the fetcher
+    is stopped, queued items are dropped without further requests. A search page is
+    checkpointed for its query when every job found on it and on the query's earlier pages
+    has finished.
+    """
+
+    def __init__(self, auth_headers, processed_ids, stats, writer=None, start_at="detail", detail_workers=DETAIL_WORKERS):
+        self.auth_headers = auth_headers
+        self.processed_ids = processed_ids
+        self.stats = stats
+        self.writer = writer
+        self._pages = {}
+        self._exhausted = set()
+        self._pages_lock = threading.Lock()
+        stages = [
+            PipelineStage("detail", self.scrape_detail, detail_workers, self.finish),
+            PipelineStage("enrich", self.enrich, ENRICH_WORKERS, self.finish),
+            PipelineStage("media", self.prepare_payloads, MEDIA_WORKERS, self.finish),
+            PipelineStage("persist", self.persist, PERSIST_WORKERS, self.finish)
+        ]
+        self.stages = stages[[stage.name for stage in stages].index(start_at):]
+        for stage, downstream in zip(self.stages, self.stages[1:]):
+            stage.downstream = downstream
+        for stage in self.stages:
+            stage.start()
+
+    def open_page(self, query, page):
+        with self._pages_lock:
+            self._pages.setdefault(query, {})[page] = {"pending": 0, "listed": False}
+
+    def track(self, item):
+        """Count an item against its page before it reaches the first stage."""
+        with self._pages_lock:
+            self._pages[item.query][item.page]["pending"] += 1
+
+    def hand_off(self, item):
+        self.stages[0].put(item)
+
+    def submit(self, item):
+        self.track(item)
+        self.hand_off(item)
+
+    def close_page(self, query, page):
+        """Mark a search page as fully listed; it is checkpointed once its jobs finish."""
+        with self._pages_lock:
+            self._pages[query][page]["listed"] = True
+        self._checkpoint()
+
+    def finish_query(self, query):
+        """Mark a query as having no more pages; its checkpoint is cleared once its last jobs finish."""
+        with self._pages_lock:
+            self._pages.setdefault(query, {})
+            self._exhausted.add(query)
+        self._checkpoint()
+
+    def finish(self, item, outcome=None):
+        """Record an item's outcome (None when dropped after a stop) and release its job ID."""
+        if item.job_id:
+            with processed_ids_lock:
+                jobs_in_progress.discard(item.job_id)
+        if outcome is not None:
+            job_journal.finished(item, outcome)
+        self.stats.record(outcome)
+        if item.page is not None:
+            with self._pages_lock:
+                self._pages[item.query][item.page]["pending"] -= 1
+        self._checkpoint()
+
+    def resume(self, item):
+        """Re-enter a job replayed from the journal; a scraped one skips straight to the media stage."""
+        if item.record is None:
+            self.hand_off(item)
+            return
+        with processed_ids_lock:
+            jobs_in_progress.add(item.job_id)
+        next(stage for stage in self.stages if stage.name == "media").put(item)
+
+    def _checkpoint(self):
+        with self._pages_lock:
+            finished = []
+            for query, pages in self._pages.items():
+                last_page = None
+                while pages:
+                    page = min(pages)
+                    if not pages[page]["listed"] or pages[page]["pending"] > 0:
+                        break
+                    del pages[page]
+                    last_page = page
+                if not pages and query in self._exhausted:
+                    finished.append((query, None))
+                elif last_page is not None:
+                    finished.append((query, last_page))
+            if finished and status_watcher.is_running():
+                self.processed_ids.flush()
+                job_journal.flush()
+                for query, last_page in finished:
+                    if last_page is None:
+                        self._exhausted.discard(query)
+                        search_checkpoints.clear(query)
+                    else:
+                        search_checkpoints.save(query, last_page)
+
+    def close(self):
+        """Drain the stages in order, then flush the batch writer."""
+        for stage in self.stages:
+            stage.close()
+        if self.writer is not None:
+            self.writer.close()
+        job_journal.flush()
+
+    def scrape_detail(self, item):
+        outcome = admit_job(item, fetch_job_record(item.job_url), self.processed_ids)
+        if outcome != 'admitted':
+            self.finish(item, outcome)
+            return None
+        return item
+
+    def enrich(self, item):
+        if not resolve_application(item.record) or not enrich_company(item.record):
+            self.finish(item)
+            return None
+        job_journal.scraped(item)
+        return item
+
+    def prepare_payloads(self, item):
+        item.job_data = item.record.to_dict()
+        item.company_id, item.company_payload = build_company_payload(item.job_data, self.auth_headers)
+        _, item.job_payload = build_job_payload(item.job_data, item.company_id, self.auth_headers)
+        return item
+
+    def persist(self, item):
+        changed = job_fingerprints.changed(item.job_id, item.job_payload)
+        if changed is not None:
+            return self.update(item, changed)
+        return self.save(item)
+
+    def update(self, item, changed, resave=True):
+        """Send only the fields that changed since the job was last saved."""
+        job_title = item.record.job_title
+        company_name = item.record.company_name
+        if not changed:
+            job_fingerprints.touch(item.job_id)
+            logger.info(f"Job unchanged since it was saved: {item.job_id} - {job_title} at {company_name}")
+            print(f"Job '{job_title}' at {company_name} (ID: {item.job_id}) unchanged - no update sent.")
+            self.finish(item, 'unchanged')
+            return None
+        result = update_job(job_title, item.job_id, {field: item.job_payload[field] for field in changed}, self.auth_headers)
+        if result == 'missing' and resave:
+            logger.info(f"Job {item.job_id} is no longer on WordPress, saving it again")
+            return self.save(item)
+        if result == 'unsupported':
+            # The stored fingerprint is kept, so the change is found again once the route exists
+            print(f"Job '{job_title}' at {company_name} (ID: {item.job_id}) changed but not updated: WordPress has no update-job route")
+            self.finish(item, 'update_unsupported')
+            return None
+        if result != 'updated':
+            self.finish(item, 'failure')
+            return None
+        job_fingerprints.store(item.job_id, item.job_payload)
+        print(f"Job '{job_title}' at {company_name} (ID: {item.job_id}) updated on WordPress: {', '.join(changed)}")
+        self.finish(item, 'updated')
+        return None
+
+    def existing(self, item):
+        """save-job found the job already on WordPress and wrote nothing: send the whole payload through update-job instead."""
+        logger.info(f"Job {item.job_id} already on WordPress, updating it with the scraped fields")
+        mark_job_saved(item.job_id, self.processed_ids, item.linkedin_id)
+        # A logo that could not be fetched (e.g. missing from the page archive) keeps the attachment WordPress has
+        fields = [field for field in item.job_payload
+                  if field != 'job_id' and (item.job_payload[field] or field not in JobFingerprints.IGNORED_FIELDS)]
+        return self.update(item, fields, resave=False)
+
+    def save(self, item):
+        job_title = item.record.job_title
+        company_name = item.record.company_name
+        if self.writer is not None:
+            self.writer.add(item.job_id, job_title, item.company_id, company_name, item.company_payload, item.job_payload,
+                            lambda saved, message: self.saved(item, saved, message))
+            return None
+
+        if not item.company_saved:
+            company_id, _ = submit_company(company_name, item.company_id, item.company_payload, self.auth_headers)
+            if company_id is None:
+                self.finish(item, 'failure')
+                return None
+            job_journal.company_saved(item)
+        job_post_id, job_post_url = submit_job(job_title, item.job_id, item.job_payload, self.auth_headers)
+        if job_post_id is None:
+            self.finish(item, 'failure')
+            return None
+        if job_post_url is None:
+            return self.existing(item)
+        mark_job_saved(item.job_id, self.processed_ids, item.linkedin_id, item.job_payload)
+        logger.info(f"Processed and saved job: {item.job_id} - {job_title} at {company_name}")
+        print(f"Job '{job_title}' at {company_name} (ID: {item.job_id}) successfully posted to WordPress. Post ID: {job_post_id}, URL {job_post_url}")
+        self.finish(item, 'success')
+        return None
+
+    def saved(self, item, saved, message):
+        """BatchWriter callback for one job of a flushed batch."""
+        job_title = item.record.job_title
+        company_name = item.record.company_name
+        if saved and message == "Job exists":
+            self.existing(item)
+            return
+        if saved:
+            mark_job_saved(item.job_id, self.processed_ids, item.linkedin_id, item.job_payload)
+            logger.info(f"Processed and saved job: {item.job_id} - {job_title} at {company_name}")
+            print(f"Job '{job_title}' at {company_name} (ID: {item.job_id}) successfully posted to WordPress in batch ({message})")
+            outcome = 'success'
+        elif saved is None:
+            # Never sent: left unfinished in the journal so the next run saves it
+            logger.info(f"Job {item.job_id} not saved before the fetcher stopped")
+            outcome = None
+        else:
+            print(f"Job '{job_title}' at {company_name} (ID: {item.job_id}) failed to post: {message}")
+            outcome = 'failure'
+        self.finish(item, outcome)
+
+def stop_pipeline_on_interrupt():
+    """On Ctrl-C, SIGTERM or a crash, make the pipeline stages drop queued jobs instead of finishing them.
+
+    Dropped jobs stay unfinished in the job journal, so closing the pipeline fits in the grace
+    period before the process is killed and the next run resumes them.
+    """
+    if not status_watcher.cancelled.is_set():
+        logger.warning("Crawl interrupted, leaving queued jobs to the next run")
+        status_watcher.cancelled.set()
+
+def handle_sigterm(signum, frame):
+    """Treat SIGTERM (a cancelled or timed-out CI job) like Ctrl-C so the state is saved on the way out."""
+    raise KeyboardInterrupt
+
+def crawl(auth_headers, processed_ids, queries=None):
+    # Check initial fetcher status
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped by initial status check")
+        print("Fetcher is not running. Exiting.")
+        return
+
+    stats = CrawlStats()
+    queries = queries or load_search_queries()
+    search_checkpoints.migrate_last_page(queries[0])
+    logger.info(f"Crawling {len(queries)} search queries: {', '.join(query.key for query in queries)}")
+    writer = BatchWriter(auth_headers) if WP_BATCH_SIZE > 0 else None
+    pipeline = JobPipeline(auth_headers, processed_ids, stats, writer)
+
+    try:
+        job_listings.sync(auth_headers)
+        for item in job_journal.replay(processed_ids):
+            pipeline.resume(item)
+
+        pagination = SearchPagination(queries, pipeline.finish_query)
+        for query, i in pagination:
+            # Check status before processing each page
+            if not status_watcher.is_running():
+                logger.info("Fetcher stopped during page processing")
+                print("Fetcher stopped by user. Exiting.")
+                break
+
+            url = query.page_url(i)
+            logger.info(f'Fetching job search page: {url}')
+            pipeline.open_page(query, i)
+            new_jobs = 0
+            try:
+                response = http_client.get(url, headers=headers, timeout=15, stage='search_page_fetch')
+                response.raise_for_status()
+                if is_challenge(response.url):
+                    logger.error("LinkedIn still redirects to login or CAPTCHA after pausing, stopping crawl")
+                    print("Login or CAPTCHA detected, stopping crawl")
+                    break
+                soup = parse_html(response.text, 'search')
+                cards = parse_search_results(soup)
+                logger.info(f'Found {len(cards)} job URLs on page: {url}')
+                metrics.incr('search_pages', query=query.key)
+                metrics.incr('jobs_listed', len(cards), query=query.key)
+
+                for index, card in enumerate(cards):
+                    if job_journal.is_resumed(card):
+                        logger.info(f"Skipping job already resumed from the journal: {card['job_url']}")
+                        new_jobs += 1
+                        continue
+                    scrape, refresh = screen_search_card(card, processed_ids, auth_headers, stats)
+                    if not scrape:
+                        continue
+                    item = JobItem(page=i, index=index, job_url=card["job_url"], query=query, linkedin_id=card["linkedin_id"], refresh=refresh)
+                    job_journal.discovered(item)
+                    pipeline.submit(item)
+                    new_jobs += 1
+
+            except Exception as e:
+                logger.error(f'Error fetching job search page: {url} - {str(e)}')
+                print(f"Error fetching page {url}: {str(e)}")
+                stats.record_page_error()
+            finally:
+                pipeline.close_page(query, i)
+                pagination.report(query, new_jobs)
+    except BaseException:
+        stop_pipeline_on_interrupt()
+        raise
+    finally:
+        pipeline.close()
+
+    if not status_watcher.is_running():
+        print("Fetcher stopped by user. Exiting.")
+
+    print_crawl_summary(stats)
+
+class ReparsedIds:
+    """processed_ids for a reparse: each archived job reaches persistence once more, where only changes since its last save are sent."""
+
+    def __init__(self, store):
+        self.store = store
+        self._seen = set()
+
+    def __contains__(self, job_id):
+        return job_id in self._seen
+
+    def add(self, job_id):
+        self._seen.add(job_id)
+        self.store.add(job_id)
+
+    def flush(self):
+        self.store.flush()
+
+def reparse(auth_headers, processed_ids):
+    """Run every archived job page through extraction, enrichment and WordPress persistence with no LinkedIn or external requests."""
+    if not page_archive.enabled:
+        logger.error("reparse needs ARCHIVE_DIR pointing at a page archive")
+        print("Set ARCHIVE_DIR to the page archive to re-parse.")
+        return
+    page_archive.replaying = True
+    job_urls = page_archive.urls('job')
+    logger.info(f"Re-parsing {len(job_urls)} archived job pages from {ARCHIVE_DIR}")
+    stats = CrawlStats()
+    writer = BatchWriter(auth_headers) if WP_BATCH_SIZE > 0 else None
+    # Pages come from disk, so the detail stage only waits for the parse workers
+    pipeline = JobPipeline(auth_headers, ReparsedIds(processed_ids), stats, writer, detail_workers=max(DETAIL_WORKERS, parse_pool.processes))
+    try:
+        for index, job_url in enumerate(job_urls):
+            if not status_watcher.is_running():
+                logger.info("Fetcher stopped during reparse")
+                break
+            pipeline.hand_off(JobItem(page=None, index=index, job_url=job_url, linkedin_id=extract_linkedin_job_id(job_url)))
+    except BaseException:
+        stop_pipeline_on_interrupt()
+        raise
+    finally:
+        pipeline.close()
+
+    if not status_watcher.is_running():
+        print("Fetcher stopped by user. Exiting.")
+
+    print_crawl_summary(stats)
+
+def print_crawl_summary(stats):
+    print("\n--- Summary ---")
+    print(f"Total jobs processed: {stats.total}")
+    print(f"Successfully posted: {stats.success}")
+    print(f"Failed to post or scrape: {stats.failure}")
+    if stats.updated or stats.unchanged:
+        print(f"Already posted jobs: {stats.updated} updated, {stats.unchanged} unchanged")
+    if stats.update_unsupported:
+        print(f"Changed jobs not updated (no update-job route): {stats.update_unsupported}")
+    print(f"Company cache: {company_cache.hits} hits, {company_cache.misses} misses")
+    print(f"Logo cache: {media_cache.hits} reused, {media_cache.uploads} uploaded")
+    connection_stats = http_client.log_connection_stats()
+    for host, totals in connection_stats.items():
+        metrics.gauge('http_connections', totals['connections'], host=host)
+    metrics.gauge('company_cache_hits', company_cache.hits)
+    metrics.gauge('company_cache_misses', company_cache.misses)
+    metrics.gauge('logo_cache_hits', media_cache.hits)
+    metrics.gauge('logo_uploads', media_cache.uploads)
+    metrics.log_summary()
+
+def fetch_job_record(job_url):
+    """Fetch and extract a LinkedIn job page; return a JobRecord or None."""
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped before fetching job details")
+        return None
+
+    logger.info(f'Fetching job details from: {job_url}')
+    try:
+        response = http_client.get(job_url, headers=headers, timeout=15, stage='detail_fetch')
+        response.raise_for_status()
+        record = parse_pool.extract("job", response, job_url)
+        log_job_record(record)
+        return record
+    except Exception as e:
+        logger.error(f'Failed to scrape job details from {job_url}: {str(e)}')
+        return None
+
+def log_job_record(record):
+    logger.info(f'Scraped Job Title: {record.job_title}')
+    logger.info(f'Scraped Company Logo URL: {record.company_logo}')
+    logger.info(f'Scraped Company Name: {record.company_name}')
+    logger.info(f'Scraped Company URL: {record.company_url}' if record.company_url else 'No Company URL found')
+    logger.info(f'Deduplicated location for {record.job_title}: {record.location}')
+    logger.info(f'Scraped Environment: {record.environment}')
+    logger.info(f'Scraped Level: {record.level}, Type: {record.job_type}, Job Functions: {record.job_functions}, Industries: {record.industries}')
+    logger.info(f'Scraped Application URL: {record.application_url}')
+
+@dataclass
+class Resolution:
+    """Where a redirect chain ended: the final URL and, when requested, its page; or the error and the hop that failed."""
+    url: str = ''
+    text: str = None
+    error: Exception = None
+    failed_url: str = ''
+
+class RedirectResolver:
+    """Follows application and company website redirect chains one hop at a time, remembering where they lead.
+
+    Hops are HEAD requests unless the final page is needed, in which case they are GETs reading
+    at most RESOLVER_BODY_BYTES. Each source URL's destination is kept for RESOLVER_TTL, and a
+    redirect host seen twice forwarding to the URL in one of its query parameters (as LinkedIn's
+    externalApply and redir links do) is afterwards decoded locally without a request. The walk
+    is a generator yielding the requests it needs, so the threaded and asyncio clients share it.
+    """
+
+    REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+    LEARN_AFTER = 2
+
+    def __init__(self, ttl=RESOLVER_TTL):
+        self.ttl = ttl
+        self._hosts = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        db = get_state_db()
+        if self._hosts is None:
+            db.execute("CREATE TABLE IF NOT EXISTS resolved_urls (source TEXT PRIMARY KEY, destination TEXT NOT NULL, resolved_at REAL NOT NULL)")
+            db.execute("CREATE TABLE IF NOT EXISTS redirect_hosts (host TEXT PRIMARY KEY, param TEXT, seen INTEGER NOT NULL)")
+            self._hosts = {host: (param, seen) for host, param, seen in db.execute("SELECT host, param, seen FROM redirect_hosts")}
+        return db
+
+    def cached_destination(self, url):
+        if page_archive.replaying:
+            # Walk the archived hops so reparse sees the same application pages the crawl did
+            return None
+        try:
+            with state_db_lock:
+                row = self._db().execute("SELECT destination, resolved_at FROM resolved_urls WHERE source = ?", (url,)).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read resolved URL for {url}: {str(e)}")
+            return None
+        if row and time.time() - row[1] < self.ttl:
+            return row[0]
+        return None
+
+    def remember(self, url, destination):
+        try:
+            with state_db_lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO resolved_urls (source, destination, resolved_at) VALUES (?, ?, ?)", (url, destination, time.time()))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record resolved URL for {url}: {str(e)}")
+
+    def shortcut(self, url):
+        """Return the target encoded in a URL of a learned redirect host, or None."""
+        parsed = urlparse(url)
+        with state_db_lock:
+            self._db()
+            param, seen = self._hosts.get(parsed.hostname, (None, 0))
+        if not param or seen < self.LEARN_AFTER:
+            return None
+        target = parse_qs(parsed.query).get(param, [''])[0]
+        return target if target.startswith(('http://', 'https://')) else None
+
+    def observe(self, url, target):
+        """Learn whether a redirect host forwards to a URL carried in its query string."""
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query)
+        param = next((name for name, values in params.items() if values[0].rstrip('/') == target.rstrip('/')), None)
+        url_params = [name for name, values in params.items() if values[0].startswith(('http://', 'https://'))]
+        if not param and not url_params:
+            return
+        try:
+            with state_db_lock:
+                db = self._db()
+                known_param, seen = self._hosts.get(parsed.hostname, (param, 0))
+                # A host that once went somewhere other than its URL parameter is never shortcut
+                seen = seen + 1 if param and param == known_param and seen >= 0 else -1
+                self._hosts[parsed.hostname] = (param, seen)
+                db.execute("INSERT OR REPLACE INTO redirect_hosts (host, param, seen) VALUES (?, ?, ?)", (parsed.hostname, param, seen))
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record redirect host {parsed.hostname}: {str(e)}")
+
+    def _walk(self, url, need_body, cache):
+        """Yield (method, url, request kwargs) for each hop and receive its response; return the Resolution."""
+        current = self.cached_destination(url)
+        if current:
+            metrics.incr('redirect_resolver', result='cached')
+            if not need_body:
+                return Resolution(current)
+        else:
+            current = url
+        for _ in range(RESOLVER_MAX_HOPS):
+            target = self.shortcut(current)
+            if target:
+                metrics.incr('redirect_resolver', result='shortcut')
+                current = target
+                continue
+            method = 'GET' if need_body else 'HEAD'
+            response = yield method, current, self._request_kwargs(method, cache)
+            if method == 'HEAD' and response.status_code >= 400:
+                # Some servers refuse HEAD; retry the hop as a GET reading only the first bytes
+                method = 'GET'
+                response = yield method, current, self._request_kwargs(method, cache)
+            metrics.incr('redirect_resolver', result='request')
+            location = response.headers.get('Location')
+            if response.status_code not in self.REDIRECT_STATUSES or not location:
+                self.remember(url, current)
+                return Resolution(current, response.text if need_body else None)
+            target = urljoin(current, location)
+            self.observe(current, target)
+            current = target
+        self.remember(url, current)
+        return Resolution(current)
+
+    @staticmethod
+    def _request_kwargs(method, cache):
+        kwargs = {"headers": headers, "timeout": 15, "allow_redirects": False, "verify": False}
+        if method == 'GET':
+            kwargs.update(max_bytes=RESOLVER_BODY_BYTES, cache=cache)
+        return kwargs
+
+    def resolve(self, url, stage, need_body=False, cache=None):
+        """Follow url to its final destination with http_client; the page text is included when need_body is set."""
+        walk = self._walk(url, need_body, cache)
+        try:
+            method, hop_url, kwargs = next(walk)
+            while True:
+                try:
+                    response = http_client.request(method, hop_url, stage=stage, **kwargs)
+                except FetcherStopped:
+                    raise
+                except Exception as e:
+                    return Resolution(error=e, failed_url=hop_url)
+                method, hop_url, kwargs = walk.send(response)
+        except StopIteration as done:
+            return done.value
+
+    @staticmethod
+    def _advance(walk, response=None):
+        """Step the walk to its next hop; return (hop, None), or (None, resolution) once it is done."""
+        try:
+            return (next(walk) if response is None else walk.send(response)), None
+        except StopIteration as done:
+            return None, done.value
+
+    async def resolve_async(self, client, url, stage, need_body=False, cache=None):
+        """resolve() over an AsyncHttpClient; the walk's state-database reads and writes run on the executor."""
+        walk = self._walk(url, need_body, cache)
+        hop, resolution = await run_blocking(self._advance, walk)
+        while hop is not None:
+            method, hop_url, kwargs = hop
+            try:
+                response = await client.request(method, hop_url, stage=stage, **kwargs)
+            except FetcherStopped:
+                raise
+            except Exception as e:
+                return Resolution(error=e, failed_url=hop_url)
+            hop, resolution = await run_blocking(self._advance, walk, response)
+        return resolution
+
+redirect_resolver = RedirectResolver()
+
+def host_root(url):
+    """Return https://<host> for the host of url, or '' when it has none."""
+    hostname = urlparse(url).hostname if url else None
+    return f"https://{hostname}" if hostname else ''
+
+def apply_application_result(record, resolved_url='', page_text=None, error=None, failed_url=''):
+    """Fill the resolved/final application fields from the followed application page, or from the error that stopped it."""
+    application_url = record.application_url
+    description_application_info = record.description_application_info
+    description_application_url = record.description_application_url
+
+    resolved_application_info = ''
+    final_application_email = description_application_info if description_application_info and '@' in description_application_info else ''
+    final_application_url = description_application_url if description_application_url else ''
+
+    if error is not None:
+        logger.error(f'Failed to follow application URL redirect: {str(error)}')
+        if host_root(failed_url):
+            final_application_url = host_root(failed_url)
+            logger.info(f'Using the host that failed to respond as application URL: {final_application_url}')
+        else:
+            final_application_url = description_application_url if description_application_url else application_url or ''
+            logger.warning(f'No external URL found in error, using fallback: {final_application_url}')
+    elif page_text is not None:
+        resolved_application_url = resolved_url
+        logger.info(f'Resolved Application URL: {resolved_application_url}')
+
+        app_soup = parse_html(page_text, 'application')
+        emails = re.findall(EMAIL_PATTERN, page_text)
+        if emails:
+            resolved_application_info = emails[0]
+            logger.info(f'Found email in application page: {resolved_application_info}')
+        else:
+            links = app_soup.find_all('a', href=True)
+            for link in links:
+                href = link['href']
+                if 'apply' in href.lower() or 'careers' in href.lower() or 'jobs' in href.lower():
+                    resolved_application_info = href
+                    logger.info(f'Found application link in application page: {resolved_application_info}')
+                    break
+
+        if final_application_email and resolved_application_info and '@' in resolved_application_info:
+            final_application_email = final_application_email if final_application_email == resolved_application_info else final_application_email
+        elif resolved_application_info and '@' in resolved_application_info:
+            final_application_email = final_application_email or resolved_application_info
+
+        if description_application_url and resolved_application_url:
+            final_application_url = description_application_url if description_application_url == resolved_application_url else resolved_application_url
+        elif resolved_application_url:
+            final_application_url = resolved_application_url
+
+    record.resolved_application_info = resolved_application_info
+    record.final_application_email = final_application_email
+    record.final_application_url = final_application_url
+    return record
+
+def resolve_application(record):
+    """Follow the application URL and fill the resolved/final application fields; return False if the fetcher stopped."""
+    if not record.application_url:
+        apply_application_result(record)
+        return True
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped before following application URL")
+        return False
+
+    try:
+        resolution = redirect_resolver.resolve(record.application_url, 'application_resolve', need_body=True, cache='application')
+    except FetcherStopped:
+        logger.info("Fetcher stopped while following application URL")
+        return False
+    if resolution.error is not None:
+        apply_application_result(record, error=resolution.error, failed_url=resolution.failed_url)
+        return True
+    try:
+        apply_application_result(record, resolution.url, resolution.text)
+    except Exception as e:
+        apply_application_result(record, error=e)
+    return True
+
+def enrich_company(record):
+    """Fill the company profile fields from the company cache or page; return False if the fetcher stopped."""
+    if not record.company_url:
+        return True
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped before fetching company page")
+        return False
+
+    try:
+        profile = company_cache.get_or_fetch(record.company_url, lambda: scrape_company_profile(record.company_url, record.company_name))
+        for field in COMPANY_PROFILE_FIELDS:
+            setattr(record, field, profile[field])
+        record.company_address = record.company_headquarters if record.company_headquarters else record.location
+        logger.info(f'Set Company Address: {record.company_address}')
+    except FetcherStopped:
+        logger.info("Fetcher stopped while fetching company details")
+        return False
+    except Exception as e:
+        logger.error(f'Failed to scrape company page {record.company_url}: {str(e)}')
+        record.company_address = record.location
+        logger.info(f'Using fallback company address: {record.company_address}')
+    return True
+
+def scrape_job_details(job_url, auth_headers):
+    """Fetch a job page and enrich it with the application and company details in one call."""
+    record = fetch_job_record(job_url)
+    if record is None:
+        return None
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped before fetching company details")
+        return None
+    if not resolve_application(record) or not enrich_company(record):
+        return None
+    return record
+
+def log_company_details(company):
+    logger.info(f'Scraped Company Details: {company["company_details"][:100] + "..." if company["company_details"] else ""}')
+
+def company_website_candidate(company, company_name):
+    """Return (url, source) for the company website to resolve; source is 'profile', 'description' or None when no request is needed."""
+    company_website_url = company["company_website_url"]
+    logger.info(f'Scraped Company Website URL: {company_website_url}')
+
+    if 'linkedin.com/redir/redirect' in company_website_url:
+        parsed_url = urlparse(company_website_url)
+        query_params = parse_qs(parsed_url.query)
+        if 'url' in query_params:
+            company_website_url = unquote(query_params['url'][0])
+            logger.info(f'Extracted external company website from redirect: {company_website_url}')
+        else:
+            logger.warning(f'No "url" param in LinkedIn redirect for {company_name}')
+
+    if company_website_url and 'linkedin.com' not in company_website_url:
+        return company_website_url, 'profile'
+    if company["about_description"]:
+        url_pattern = r'https?://(?!www\.linkedin\.com)[^\s]+'
+        urls = re.findall(url_pattern, company["about_description"])
+        if urls:
+            logger.info(f'Found company website in description: {urls[0]}')
+            return urls[0], 'description'
+    return company_website_url, None
+
+def website_from_resolution(resolution, source, company_name):
+    """Return the company website to keep from a resolved redirect chain."""
+    if resolution.error is None:
+        logger.info(f'Resolved Company Website URL: {resolution.url}')
+        return resolution.url
+    if source == 'description':
+        logger.error(f'Failed to resolve company website from description: {str(resolution.error)}')
+        return ''
+    logger.error(f'Failed to resolve company website URL: {str(resolution.error)}')
+    if host_root(resolution.failed_url):
+        company_website_url = host_root(resolution.failed_url)
+        logger.info(f'Using the host that failed to respond as company website: {company_website_url}')
+        return company_website_url
+    logger.warning(f'No company website host to fall back to for {company_name}')
+    return ''
+
+def company_profile_fields(company, company_website_url):
+    """Return the cached company profile fields with the resolved website."""
+    logger.info(f'Scraped Company Industry: {company["company_industry"]}, Size: {company["company_size"]}, '
+                f'Headquarters: {company["company_headquarters"]}, Type: {company["company_type"]}, '
+                f'Founded: {company["company_founded"]}, Specialties: {company["company_specialties"]}')
+    company["company_website_url"] = company_website_url
+    return {field: company[field] for field in COMPANY_PROFILE_FIELDS}
+
+def scrape_company_profile(company_url, company_name):
+    """Fetch and parse a LinkedIn company page into the cached company profile fields."""
+    logger.info(f'Fetching company page: {company_url}')
+    company_response = http_client.get(company_url, headers=headers, timeout=15, stage='company_page_fetch', cache='company')
+    company_response.raise_for_status()
+    company = parse_pool.extract("company", company_response, company_url)
+    log_company_details(company)
+
+    company_website_url, source = company_website_candidate(company, company_name)
+    if source:
+        if not status_watcher.is_running():
+            raise FetcherStopped("Fetcher stopped before resolving company website")
+        resolution = redirect_resolver.resolve(company_website_url, 'website_resolve', cache='website')
+        company_website_url = website_from_resolution(resolution, source, company_name)
+    return company_profile_fields(company, company_website_url)
+
+class AsyncResponse:
+    """The parts of an aiohttp response the crawl reads, shaped like requests.Response."""
+
+    def __init__(self, status_code, url, content, response_headers):
+        self.status_code = status_code
+        self.url = url
+        self.content = content
+        self.headers = response_headers
+        self.encoding = requests.utils.get_encoding_from_headers(response_headers) or 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+async def read_limited_async(resp, max_bytes):
+    """read_limited() for aiohttp: StreamReader.read(n) returns what is buffered, so read until EOF or max_bytes."""
+    body = bytearray()
+    while len(body) < max_bytes:
+        chunk = await resp.content.read(max_bytes - len(body))
+        if not chunk:
+            break
+        body.extend(chunk)
+    return bytes(body)
+
+class AsyncHttpClient:
+    """aiohttp counterpart of HttpClient: pooled connections, the same host rate limits, retry policy and metrics."""
+
+    RETRY_STATUSES = (500, 502, 503, 504)
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES, max_connections=ASYNC_CONCURRENCY, per_host=HTTP_POOL_MAXSIZE):
+        if not HAS_AIOHTTP:
+            raise RuntimeError("FETCHER_MODE=async needs aiohttp: pip install aiohttp")
+        self.timeout = timeout
+        self.retries = retries
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=max(1, max_connections), limit_per_host=per_host))
+        self.parse_executor = ThreadPoolExecutor(max_workers=max(1, ASYNC_PARSE_WORKERS), thread_name_prefix="parse")
+
+    async def offload(self, func, *args):
+        """Run CPU-bound parsing on the parse threads."""
+        return await asyncio.get_running_loop().run_in_executor(self.parse_executor, functools.partial(func, *args))
+
+    async def request(self, method, url, stage=None, cache=None, **kwargs):
+        """HttpClient.request() for coroutines, sharing the same on-disk response cache and page archive."""
+        response = await self._cached(method, url, stage, cache, **kwargs)
+        if method.upper() in ('GET', 'HEAD') and page_archive.archives(stage):
+            await run_blocking(page_archive.record, stage, url, response)
+        return response
+
+    async def _cached(self, method, url, stage, cache, **kwargs):
+        if not cache or method.upper() != 'GET' or not http_cache.enabled:
+            return await self._request(method, url, stage, **kwargs)
+        entry, fresh = await run_blocking(http_cache.lookup, url, cache)
+        if fresh:
+            await run_blocking(http_cache.touch, url)
+            metrics.incr('http_cache', result='hit', kind=cache)
+            return self.cached_response(entry)
+        if entry is not None:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **http_cache.validators(entry))
+        response = await self._request(method, url, stage, **kwargs)
+        if entry is not None and response.status_code == 304:
+            await run_blocking(http_cache.touch, url, True)
+            metrics.incr('http_cache', result='revalidated', kind=cache)
+            return self.cached_response(entry)
+        metrics.incr('http_cache', result='miss', kind=cache)
+        if response.status_code == 200:
+            await run_blocking(http_cache.store, url, cache, response.url, response.headers, response.content)
+        return response
+
+    @staticmethod
+    def cached_response(entry):
+        return AsyncResponse(200, entry["url"], entry["body"], requests.structures.CaseInsensitiveDict(entry["headers"]))
+
+    async def _request(self, method, url, stage=None, timeout=None, allow_redirects=True, verify=True, max_bytes=None, **kwargs):
+        host = rate_limiter.host_key(url)
+        while True:
+            with metrics.timer('rate_limit_wait', host=host):
+                await rate_limiter.acquire_async(url)
+            status = 'error'
+            started = time.monotonic()
+            try:
+                response = await self._send(method.upper(), url, host, timeout or self.timeout, allow_redirects, verify, max_bytes, kwargs)
+                status = response.status_code
+            finally:
+                metrics.incr('http_requests', host=host, status=status)
+                if stage:
+                    metrics.observe(stage, time.monotonic() - started)
+            if not rate_limiter.feedback(url, response):
+                return response
+
+    async def _send(self, method, url, host, timeout, allow_redirects, verify, max_bytes, kwargs):
+        """Send with the urllib3 Retry policy HttpClient uses: no wait before the first retry, then backoff doubling from 2s."""
+        attempt = 0
+        while True:
+            try:
+                async with self.session.request(method, url, timeout=aiohttp.ClientTimeout(total=timeout),
+                                                allow_redirects=allow_redirects, ssl=None if verify else False, **kwargs) as resp:
+                    body = await read_limited_async(resp, max_bytes) if max_bytes else await resp.read()
+                    response = AsyncResponse(resp.status, str(resp.url), body, resp.headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retryable = isinstance(e, aiohttp.ClientConnectorError) or method in self.IDEMPOTENT_METHODS
+                if not retryable or attempt >= self.retries:
+                    raise requests.exceptions.ConnectionError(f"{type(e).__name__} for url: {url}: {str(e)}")
+                retry_after = None
+            else:
+                if response.status_code not in self.RETRY_STATUSES or method not in self.IDEMPOTENT_METHODS:
+                    return response
+                if attempt >= self.retries:
+                    raise requests.exceptions.RetryError(f"Max retries exceeded with url: {url} (too many {response.status_code} error responses)")
+                retry_after = response.headers.get('Retry-After') if response.status_code == 503 else None
+            attempt += 1
+            metrics.incr('http_retries', host=host)
+            delay = 0 if attempt <= 1 else min(120, 2 ** (attempt - 1))
+            if retry_after and retry_after.isdigit():
+                delay = int(retry_after)
+            if delay and not await status_watcher_wait_async(delay):
+                raise FetcherStopped(f"Fetcher stopped while retrying {url}")
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        return await self.request('HEAD', url, **kwargs)
+
+    async def close(self):
+        await self.session.close()
+        self.parse_executor.shutdown(wait=True)
+
+async def run_blocking(func, *args):
+    """Run a SQLite or WordPress call on the default executor so the other coroutines keep running."""
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+async def status_watcher_wait_async(seconds):
+    """Sleep for up to seconds; return False as soon as the fetcher is stopped."""
+    deadline = time.monotonic() + seconds
+    while not status_watcher.cancelled.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return True
+        await asyncio.sleep(min(remaining, 0.25))
+    return False
+
+async def fetch_job_record_async(client, job_url):
+    """asyncio version of fetch_job_record()."""
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped before fetching job details")
+        return None
+
+    logger.info(f'Fetching job details from: {job_url}')
+    try:
+        response = await client.get(job_url, headers=headers, timeout=15, stage='detail_fetch')
+        response.raise_for_status()
+        record = await parse_pool.extract_async("job", response, job_url, client.offload)
+        log_job_record(record)
+        return record
+    except Exception as e:
+        logger.error(f'Failed to scrape job details from {job_url}: {str(e)}')
+        return None
+
+async def resolve_application_async(client, record):
+    """asyncio version of resolve_application()."""
+    if not record.application_url:
+        apply_application_result(record)
+        return True
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped before following application URL")
+        return False
+
+    try:
+        resolution = await redirect_resolver.resolve_async(client, record.application_url, 'application_resolve', need_body=True, cache='application')
+    except FetcherStopped:
+        logger.info("Fetcher stopped while following application URL")
+        return False
+    if resolution.error is not None:
+        apply_application_result(record, error=resolution.error, failed_url=resolution.failed_url)
+        return True
+    try:
+        await client.offload(apply_application_result, record, resolution.url, resolution.text)
+    except Exception as e:
+        apply_application_result(record, error=e)
+    return True
+
+async def scrape_company_profile_async(client, company_url, company_name):
+    """asyncio version of scrape_company_profile()."""
+    logger.info(f'Fetching company page: {company_url}')
+    company_response = await client.get(company_url, headers=headers, timeout=15, stage='company_page_fetch', cache='company')
+    company_response.raise_for_status()
+    company = await parse_pool.extract_async("company", company_response, company_url, client.offload)
+    log_company_details(company)
+
+    company_website_url, source = company_website_candidate(company, company_name)
+    if source:
+        if not status_watcher.is_running():
+            raise FetcherStopped("Fetcher stopped before resolving company website")
+        resolution = await redirect_resolver.resolve_async(client, company_website_url, 'website_resolve', cache='website')
+        company_website_url = website_from_resolution(resolution, source, company_name)
+    return company_profile_fields(company, company_website_url)
+
+async def enrich_company_async(client, record):
+    """asyncio version of enrich_company()."""
+    if not record.company_url:
+        return True
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped before fetching company page")
+        return False
+
+    try:
+        profile = await company_cache.get_or_fetch_async(record.company_url, lambda: scrape_company_profile_async(client, record.company_url, record.company_name))
+        for field in COMPANY_PROFILE_FIELDS:
+            setattr(record, field, profile[field])
+        record.company_address = record.company_headquarters if record.company_headquarters else record.location
+        logger.info(f'Set Company Address: {record.company_address}')
+    except FetcherStopped:
+        logger.info("Fetcher stopped while fetching company details")
+        return False
+    except Exception as e:
+        logger.error(f'Failed to scrape company page {record.company_url}: {str(e)}')
+        record.company_address = record.location
+        logger.info(f'Using fallback company address: {record.company_address}')
+    return True
+
+def parse_search_page(markup):
+    return parse_search_results(parse_html(markup, 'search'))
+
+async def crawl_async(auth_headers, processed_ids, queries=None):
+    """asyncio version of crawl(): search, job, application and company requests run as coroutines.
+
+    Up to ASYNC_CONCURRENCY jobs are in flight at once, parsing runs on ASYNC_PARSE_WORKERS
+    threads, and enriched jobs are handed to the media and persistence stages of JobPipeline,
+    so logos and WordPress saves go through exactly the same code as the threaded crawl.
+    """
+    # Check initial fetcher status
+    if not status_watcher.is_running():
+        logger.info("Fetcher stopped by initial status check")
+        print("Fetcher is not running. Exiting.")
+        return
+
+    stats = CrawlStats()
+    queries = queries or load_search_queries()
+    search_checkpoints.migrate_last_page(queries[0])
+    logger.info(f"Crawling {len(queries)} search queries: {', '.join(query.key for query in queries)}")
+    writer = BatchWriter(auth_headers) if WP_BATCH_SIZE > 0 else None
+    pipeline = JobPipeline(auth_headers, processed_ids, stats, writer, start_at="media")
+    client = AsyncHttpClient()
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max(1, ASYNC_CONCURRENCY))
+    tasks = set()
+
+    async def process(item):
+        try:
+            outcome = await run_blocking(admit_job, item, await fetch_job_record_async(client, item.job_url), processed_ids)
+            if outcome != 'admitted':
+                await run_blocking(pipeline.finish, item, outcome)
+                return
+            if not await resolve_application_async(client, item.record) or not await enrich_company_async(client, item.record):
+                await run_blocking(pipeline.finish, item)
+                return
+            await run_blocking(job_journal.scraped, item)
+            # Blocks while the media stage is full, holding this job's slot
+            await loop.run_in_executor(None, pipeline.hand_off, item)
+        except Exception as e:
+            logger.error(f"Failed to process job {item.job_url}: {str(e)}")
+            await run_blocking(pipeline.finish, item, 'failure')
+        finally:
+            slots.release()
+
+    async def spawn(item):
+        await slots.acquire()
+        task = asyncio.create_task(process(item))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    try:
+        await run_blocking(job_listings.sync, auth_headers)
+        for item in await run_blocking(job_journal.replay, processed_ids):
+            if item.record is None:
+                await spawn(item)
+            else:
+                await loop.run_in_executor(None, pipeline.resume, item)
+
+        pagination = SearchPagination(queries, pipeline.finish_query)
+        for query, i in pagination:
+            # Check status before processing each page
+            if not status_watcher.is_running():
+                logger.info("Fetcher stopped during page processing")
+                print("Fetcher stopped by user. Exiting.")
+                break
+
+            url = query.page_url(i)
+            logger.info(f'Fetching job search page: {url}')
+            pipeline.open_page(query, i)
+            new_jobs = 0
+            try:
+                response = await client.get(url, headers=headers, timeout=15, stage='search_page_fetch')
+                response.raise_for_status()
+                if is_challenge(response.url):
+                    logger.error("LinkedIn still redirects to login or CAPTCHA after pausing, stopping crawl")
+                    print("Login or CAPTCHA detected, stopping crawl")
+                    break
+                cards = await client.offload(parse_search_page, response.text)
+                logger.info(f'Found {len(cards)} job URLs on page: {url}')
+                metrics.incr('search_pages', query=query.key)
+                metrics.incr('jobs_listed', len(cards), query=query.key)
+
+                for index, card in enumerate(cards):
+                    if job_journal.is_resumed(card):
+                        logger.info(f"Skipping job already resumed from the journal: {card['job_url']}")
+                        new_jobs += 1
+                        continue
+                    scrape, refresh = await run_blocking(screen_search_card, card, processed_ids, auth_headers, stats)
+                    if not scrape:
+                        continue
+                    item = JobItem(page=i, index=index, job_url=card["job_url"], query=query, linkedin_id=card["linkedin_id"], refresh=refresh)
+                    await run_blocking(job_journal.discovered, item)
+                    pipeline.track(item)
+                    await spawn(item)
+                    new_jobs += 1
+
+            except Exception as e:
+                logger.error(f'Error fetching job search page: {url} - {str(e)}')
+                print(f"Error fetching page {url}: {str(e)}")
+                stats.record_page_error()
+            finally:
+                await run_blocking(pipeline.close_page, query, i)
+                pagination.report(query, new_jobs)
+        if tasks:
+            await asyncio.gather(*tasks)
+    except BaseException:
+        stop_pipeline_on_interrupt()
+        raise
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await client.close()
+        await loop.run_in_executor(None, pipeline.close)
+
+    if not status_watcher.is_running():
+        print("Fetcher stopped by user. Exiting.")
+
+    print_crawl_summary(stats)
+
+def main():
+    # Fetch credentials if not provided
+    if not fetch_credentials():
+        logger.error("Cannot proceed without valid WordPress credentials")
+        print("Error: Cannot proceed without valid WordPress credentials")
+        return
+
+    # Create authentication headers
+    auth_string = f"{WP_USERNAME}:{WP_APP_PASSWORD}"
+    auth_headers = {
+        "Authorization": f"Basic {base64.b64encode(auth_string.encode()).decode()}"
+    }
+
+    # Load processed job IDs
+    processed_ids = load_processed_ids()
+
+    if METRICS_PORT:
+        metrics.serve(METRICS_PORT)
+
+    command = sys.argv[1] if len(sys.argv) > 1 else 'crawl'
+    if command == 'reparse' and not parse_pool.enabled:
+        # Re-parsing is CPU-bound, so use every core unless PARSE_PROCESSES says otherwise
+        parse_pool.processes = os.cpu_count() or 1
+    parse_pool.start()
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    # Watch the fetcher status in the background and start crawling
+    status_watcher.start(auth_headers)
+    try:
+        if command == 'reparse':
+            reparse(auth_headers, processed_ids)
+        elif FETCHER_MODE == 'async' and not HAS_AIOHTTP:
+            logger.error("FETCHER_MODE=async needs aiohttp, falling back to the threaded crawl")
+            print("aiohttp is not installed, running the threaded crawl instead.")
+            crawl(auth_headers, processed_ids)
+        elif FETCHER_MODE == 'async':
+            asyncio.run(crawl_async(auth_headers, processed_ids))
+        else:
+            crawl(auth_headers, processed_ids)
+    finally:
+        status_watcher.stop()
+        parse_pool.shutdown()
+        processed_ids.flush()
+        job_journal.flush()
+        page_archive.close()
+        close_state_db()
+        metrics.export()
 
 if __name__ == "__main__":
     main()